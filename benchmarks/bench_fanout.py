@@ -0,0 +1,87 @@
+"""Бенчмарк записи выходных файлов в пул потоков и одним архивом на «медленной» файловой системе.
+
+Сетевая папка (SMB) имитируется задержкой на открытие и закрытие каждого файла: именно эти
+запросы к серверу, а не объем данных, определяют время записи сотен маленьких файлов.
+
+Запуск из корня репозитория: python benchmarks/bench_fanout.py [--actors 150] [--latency-ms 8] [--workers 1,2,4,8,16]
+"""
+import os
+import sys
+import time
+import argparse
+import builtins
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from subtitle_splitter import writers
+from subtitle_splitter.core import classify_events, save_actor_files
+from bench_writers import make_events
+
+class ThrottledFile:
+    """Обертка над файлом, добавляющая задержку при закрытии (как сброс файла на сервер)."""
+
+    def __init__(self, file, latency):
+        self._file = file
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        time.sleep(self._latency)
+        self._file.close()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+def throttled_open(latency):
+    def open_file(*args, **kwargs):
+        time.sleep(latency)
+        return ThrottledFile(builtins.open(*args, **kwargs), latency)
+    return open_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Запись файлов актеров последовательно и в пуле потоков при задержке ФС")
+    parser.add_argument('--actors', type=int, default=150)
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--latency-ms', type=float, default=8.0)
+    parser.add_argument('--workers', default='1,2,4,8,16')
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.disable(logging.WARNING)
+    events = make_events(args.lines)
+    for event in events:
+        event.name = f"Актер {event.index % args.actors}"
+    classification = classify_events(events)
+    headers = ['Title: bench', 'ScriptType: v4.00+']
+    styles = ['Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1']
+
+    writers.open = throttled_open(args.latency_ms / 1000)
+    try:
+        print(f"Файлов: {len(classification.actors)}, задержка открытия и закрытия {args.latency_ms} мс")
+        baseline = None
+        for workers in (int(value) for value in args.workers.split(',')):
+            with tempfile.TemporaryDirectory() as tmp:
+                started = time.perf_counter()
+                save_actor_files(headers, styles, classification.actors, [], [], {}, [], tmp, 'bench', 'srt', True, True, False,
+                                 classification.all_actors, actor_index=classification.actor_index, io_workers=workers)
+                elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"потоков {workers:>2}: {elapsed * 1000:8.1f} мс   ускорение x{baseline / elapsed:.2f}")
+        for bundle, compress in (('zip', False), ('zip', True)):
+            with tempfile.TemporaryDirectory() as tmp:
+                started = time.perf_counter()
+                save_actor_files(headers, styles, classification.actors, [], [], {}, [], tmp, 'bench', 'srt', True, True, False,
+                                 classification.all_actors, actor_index=classification.actor_index, bundle=bundle, compress=compress)
+                elapsed = time.perf_counter() - started
+            print(f"архив {bundle}{' со сжатием' if compress else ''}: {elapsed * 1000:8.1f} мс   ускорение x{baseline / elapsed:.2f}")
+    finally:
+        del writers.open
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Бенчмарк разбора: построчное текстовое чтение против mmap на скрипте со встроенными шрифтами,
+а также память разобранных событий по сравнению с исходными строками Dialogue (tracemalloc).
+
+Запуск из корня репозитория: python benchmarks/bench_parser.py [--lines 20000] [--fonts-mb 30] [--repeat 3]
+"""
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from subtitle_splitter.core import parse_ass_file
+from bench_writers import best_time
+from synth import ScriptSpec, write_script
+
+def traced_mb(func):
+    """Объем памяти (МБ), который занимает результат func(), по tracemalloc."""
+    tracemalloc.start()
+    try:
+        result = func()
+        used = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return used / (1024 * 1024)
+
+def raw_dialogue_lines(path):
+    """Строки Dialogue без пробелов по краям — то, что хранил разбор до введения Event."""
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        return [line.strip() for line in file if line.startswith('Dialogue:')]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение скорости разбора .ass: text против mmap")
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--fonts-mb', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        for fonts_mb in sorted({0, args.fonts_mb}):
+            path = os.path.join(tmp, f'fonts_{fonts_mb}.ass')
+            write_script(path, ScriptSpec(args.lines, fonts_mb=fonts_mb))
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            text = best_time(lambda: parse_ass_file(path, 'text'), args.repeat)
+            mapped = best_time(lambda: parse_ass_file(path, 'mmap'), args.repeat)
+            print(f"{args.lines} строк, шрифты {fonts_mb} МБ (файл {size_mb:.1f} МБ): text {text * 1000:8.1f} мс   "
+                  f"mmap {mapped * 1000:8.1f} мс   ускорение x{text / mapped:.2f}")
+        raw_mb = traced_mb(lambda: raw_dialogue_lines(path))
+        events_mb = traced_mb(lambda: parse_ass_file(path, 'text'))
+        print(f"память: строки Dialogue {raw_mb:.1f} МБ, разобранные события {events_mb:.1f} МБ (x{events_mb / raw_mb:.2f})")
+
+if __name__ == '__main__':
+    main()
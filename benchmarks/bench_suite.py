@@ -0,0 +1,185 @@
+"""Набор бенчмарков конвейера: разбор, классификация и запись на синтетических скриптах разного размера.
+
+Каждый размер прогоняется в отдельном процессе, чтобы пиковая память одного случая не влияла
+на другой. Для каждой фазы замеряется лучшее время из --repeat прогонов и пиковый RSS (на Linux —
+отдельно по фазам через сброс VmHWM, на других системах — накопленный пик процесса).
+
+Запуск из корня репозитория:
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k,1m --output results.json
+    python benchmarks/bench_suite.py --baseline results.json --threshold 0.2
+
+С --baseline скрипт завершается с кодом 1, если время или память какой-либо фазы выросли
+больше чем на порог относительно сохраненных результатов.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from subtitle_splitter.core import parse_ass_file, classify_events, save_actor_files
+from synth import parse_size, write_script, add_spec_arguments, spec_from_args
+
+PHASES = ('parse', 'classify', 'write')
+# Разница меньше этой не считается регрессией: на маленьких скриптах время — шум
+MIN_DELTA_SECONDS = 0.005
+MIN_DELTA_RSS_MB = 2.0
+
+def reset_peak_rss():
+    """Сбрасывает пик RSS процесса (только Linux); False, если это невозможно."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    """Пиковый RSS процесса в МБ или None, если его нельзя узнать."""
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS отдает байты, Linux — килобайты
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_case(path, export_format, repeat):
+    """Прогоняет конвейер repeat раз; возвращает {фаза: {'seconds': лучшее время, 'peak_rss_mb': пик}}."""
+    import logging
+    logging.disable(logging.WARNING)
+    phases = {phase: {'seconds': None, 'peak_rss_mb': None} for phase in PHASES}
+
+    def measure(phase, func):
+        reset_peak_rss()
+        started = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - started
+        peak = peak_rss_mb()
+        stats = phases[phase]
+        stats['seconds'] = elapsed if stats['seconds'] is None else min(stats['seconds'], elapsed)
+        if peak is not None:
+            stats['peak_rss_mb'] = peak if stats['peak_rss_mb'] is None else max(stats['peak_rss_mb'], peak)
+        return value
+
+    files = 0
+    for _ in range(repeat):
+        headers, styles, events = measure('parse', lambda: parse_ass_file(path))
+        if events is None:
+            raise RuntimeError(f"Не удалось разобрать {path}")
+        result = measure('classify', lambda: classify_events(events))
+        del events
+        with tempfile.TemporaryDirectory() as output_dir:
+            written = measure('write', lambda: save_actor_files(
+                headers, styles, result.actors, result.group_lines, result.multiple_actor_lines, result.excluded_actor_groups, result.sign_lines,
+                output_dir, 'bench', export_format, True, True, True, result.all_actors, actor_index=result.actor_index))
+        if written is None:
+            raise RuntimeError("Не удалось записать файлы")
+        files = len(written)
+        del result
+    return {'phases': phases, 'files': files}
+
+def run_suite(sizes, spec_args, export_format, repeat, workdir):
+    cases = []
+    context = multiprocessing.get_context('spawn')
+    for lines in sizes:
+        spec = spec_from_args(spec_args, lines)
+        path = os.path.join(workdir, f'synthetic_{lines}.ass')
+        size = write_script(path, spec)
+        with context.Pool(1) as pool:
+            measured = pool.apply(run_case, (path, export_format, repeat))
+        os.remove(path)
+        cases.append({'name': case_name(lines), 'spec': spec.as_dict(), 'file_mb': round(size / (1024 * 1024), 2), **measured})
+        print(format_case(cases[-1]), flush=True)
+    return cases
+
+def case_name(lines):
+    if lines % 1000000 == 0:
+        return f"{lines // 1000000}m"
+    if lines % 1000 == 0:
+        return f"{lines // 1000}k"
+    return str(lines)
+
+def format_case(case):
+    parts = []
+    for phase in PHASES:
+        stats = case['phases'][phase]
+        rss = f", {stats['peak_rss_mb']:.0f} МБ" if stats['peak_rss_mb'] is not None else ""
+        parts.append(f"{phase} {stats['seconds'] * 1000:9.1f} мс{rss}")
+    return f"{case['name']:>5} ({case['file_mb']:.1f} МБ, файлов {case['files']}): " + "   ".join(parts)
+
+def find_regressions(cases, baseline, threshold, rss_threshold):
+    """Сравнивает с baseline (результаты прошлого запуска) и возвращает список описаний регрессий."""
+    previous = {case['name']: case for case in baseline.get('cases', [])}
+    regressions = []
+    for case in cases:
+        old = previous.get(case['name'])
+        if old is None:
+            continue
+        for phase in PHASES:
+            new_stats, old_stats = case['phases'][phase], old['phases'].get(phase, {})
+            old_seconds = old_stats.get('seconds')
+            if old_seconds and new_stats['seconds'] - old_seconds > max(old_seconds * threshold, MIN_DELTA_SECONDS):
+                regressions.append(f"{case['name']}/{phase}: время {old_seconds * 1000:.1f} → {new_stats['seconds'] * 1000:.1f} мс")
+            old_rss, new_rss = old_stats.get('peak_rss_mb'), new_stats['peak_rss_mb']
+            if old_rss and new_rss is not None and new_rss - old_rss > max(old_rss * rss_threshold, MIN_DELTA_RSS_MB):
+                regressions.append(f"{case['name']}/{phase}: память {old_rss:.0f} → {new_rss:.0f} МБ")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки разбора, классификации и записи на синтетических скриптах")
+    parser.add_argument('--sizes', default='1k,10k,100k,1m', help="Размеры скриптов в строках Dialogue через запятую")
+    parser.add_argument('--format', dest='export_format', choices=['ass', 'srt'], default='ass')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Сохранить результаты в JSON")
+    parser.add_argument('--baseline', help="JSON с прошлыми результатами для проверки регрессий")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Допустимый рост времени фазы (0.2 — на 20%%)")
+    parser.add_argument('--rss-threshold', type=float, default=0.2, help="Допустимый рост пиковой памяти фазы")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = run_suite(sizes, args, args.export_format, args.repeat, workdir)
+
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'format': args.export_format,
+        'repeat': args.repeat,
+        'cases': cases,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены: {args.output}")
+
+    if baseline is not None:
+        regressions = find_regressions(cases, baseline, args.threshold, args.rss_threshold)
+        if regressions:
+            print("Регрессии относительно " + args.baseline + ":")
+            for regression in regressions:
+                print("  " + regression)
+            return 1
+        print(f"Регрессий относительно {args.baseline} нет")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Микробенчмарк записи: построчный file.write версии 1.0.2 по исходным строкам против сборки файла одной записью.
+
+Запуск из корня репозитория: python benchmarks/bench_writers.py [--lines 20000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from subtitle_splitter.events import Event
+from subtitle_splitter.timecode import format_ass_time
+from subtitle_splitter.core import save_ass_file, save_srt_file
+from subtitle_splitter.writers import AssHeader
+
+def make_lines(count, seed=1):
+    """Генерирует count строк Dialogue с тегами, переносами \\N и растущим временем."""
+    rng = random.Random(seed)
+    lines = []
+    start = 0
+    for index in range(count):
+        start += rng.randint(0, 300)
+        end = start + rng.randint(50, 400)
+        lines.append(f"Dialogue: 0,{format_ass_time(start)},{format_ass_time(end)},Default,Актер {rng.randint(1, 20)},0,0,0,,"
+                     f"{{\\i1}}Реплика номер {index}\\Nвторая строка{{i}} {{\\b1}}текст{{\\b0}}")
+    return lines
+
+def make_events(count, seed=1):
+    """То же, что make_lines, но разобранное в события Event."""
+    return [Event.parse(line, index) for index, line in enumerate(make_lines(count, seed))]
+
+# Прежние (1.0.2) функции записи без изменений: они работают с исходными строками Dialogue
+
+def legacy_format_srt_time(ass_time):
+    parts = ass_time.split(':')
+    if len(parts) != 3:
+        return ass_time.replace('.', ',')
+    hours = parts[0].zfill(2)
+    minutes = parts[1]
+    seconds, centiseconds = parts[2].split('.')
+    milliseconds = centiseconds.ljust(3, '0')[:3]
+    return f"{hours}:{minutes}:{seconds},{milliseconds}"
+
+def legacy_save_ass_file(headers, styles, events, output_file):
+    """Запись 1.0.2: по одному file.write на каждую строку."""
+    with open(output_file, 'w', encoding='utf-8') as file:
+        file.write('[Script Info]\n')
+        for header in headers:
+            file.write(header + '\n')
+        file.write('\n[V4+ Styles]\n')
+        file.write('Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n')
+        for style in styles:
+            file.write(style + '\n')
+        file.write('\n[Events]\n')
+        file.write('Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n')
+        for event in events:
+            file.write(event + '\n')
+
+def legacy_save_srt_file(events, output_file):
+    """Запись 1.0.2: split строки, строковое преобразование времени и file.write на событие."""
+    with open(output_file, 'w', encoding='utf-8') as file:
+        start_time = "00:00:00,000"
+        if events:
+            first_event = events[0].split(',', 9)
+            if len(first_event) >= 3:
+                start_time = legacy_format_srt_time(first_event[1])
+        file.write("1\n00:00:00,000 --> " + start_time + "\n(Защита от удаления первого саба REAPER'ом!)\n\n")
+        for index, event in enumerate(events, 2):
+            parts = event.split(',', 9)
+            if len(parts) < 10:
+                continue
+            start_time = legacy_format_srt_time(parts[1])
+            end_time = legacy_format_srt_time(parts[2])
+            text = parts[9].replace('\\N', ' ').replace('{i}', '')
+            text = ''.join(c for c in text if c not in '{}')
+            file.write(f"{index}\n{start_time} --> {end_time}\n{text}\n\n")
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение скорости записи .ass/.srt")
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    import logging
+    logging.disable(logging.INFO)
+    lines = make_lines(args.lines)
+    events = [Event.parse(line, index) for index, line in enumerate(lines)]
+    headers = ['Title: bench', 'ScriptType: v4.00+']
+    styles = ['Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out')
+        cases = [
+            ('ass', lambda: legacy_save_ass_file(headers, styles, lines, path), lambda: save_ass_file(headers, styles, events, path)),
+            ('srt', lambda: legacy_save_srt_file(lines, path), lambda: save_srt_file(events, path)),
+        ]
+        # Режим «не распределять»: сотни однострочных файлов с большим заголовком на 200 стилей
+        many_styles = [f'Style: Стиль {i},Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1' for i in range(200)] + styles
+        singles = [[event] for event in events[:500]]
+        legacy_singles = [[line] for line in lines[:500]]
+        header = AssHeader(headers, many_styles)
+        cases.append(('ass x500 однострочных', lambda: [legacy_save_ass_file(headers, many_styles, single, path) for single in legacy_singles],
+                      lambda: [save_ass_file(headers, many_styles, single, path, header) for single in singles]))
+        print(f"Событий: {args.lines}, лучший из {args.repeat} запусков")
+        for name, legacy, current in cases:
+            legacy_time = best_time(legacy, args.repeat)
+            current_time = best_time(current, args.repeat)
+            verdict = 'быстрее' if current_time < legacy_time else 'медленнее'
+            print(f"{name}: 1.0.2 построчно {legacy_time * 1000:.1f} мс, одной записью {current_time * 1000:.1f} мс "
+                  f"(x{legacy_time / current_time:.2f}, {verdict})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Проверка времени импорта: ядро и пакетный режим должны загружаться без GUI и укладываться в бюджет.
+
+Каждая цель импортируется в отдельном процессе с `python -X importtime`; суммарное время берется
+по строке самого модуля (cumulative), а в списке загруженных модулей не должно быть tkinter,
+keyboard и tkinterdnd2. Точка входа SubtitleSplitter_1.1.0.py проверяется запуском с --help.
+
+Запуск из корня репозитория: python benchmarks/check_importtime.py [--budget-ms 150] [--repeat 5]
+Код возврата 1, если бюджет превышен или подгружен модуль GUI.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+ENTRY_SCRIPT = os.path.join(SRC_DIR, 'SubtitleSplitter_1.1.0.py')
+TARGETS = ('subtitle_splitter', 'subtitle_splitter.core', 'subtitle_splitter.cli')
+FORBIDDEN = ('tkinter', 'keyboard', 'tkinterdnd2')
+
+def parse_importtime(stderr):
+    """Разбирает вывод -X importtime в {модуль: (cumulative в микросекундах, верхний уровень ли это импорт)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Вложенные импорты сдвинуты на два пробела на уровень
+        modules[name.strip()] = (int(cumulative), not name.startswith('  '))
+    return modules
+
+def measure(args):
+    """Запускает python -X importtime с args; возвращает результат parse_importtime или бросает RuntimeError."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=SRC_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"код {completed.returncode}")
+    return parse_importtime(completed.stderr)
+
+def check_target(label, args, root_module, budget_ms, repeat):
+    """Лучшее время импорта root_module за repeat запусков; возвращает список проблем."""
+    best = None
+    loaded = set()
+    for _ in range(repeat):
+        try:
+            modules = measure(args)
+        except RuntimeError as e:
+            print(f"{label:<40} ошибка: {e}")
+            return [f"{label}: {e}"]
+        loaded.update(modules)
+        if root_module is None:
+            total = sum(cumulative for cumulative, top_level in modules.values() if top_level)
+        else:
+            total = modules.get(root_module, (0, True))[0]
+        best = total if best is None else min(best, total)
+    problems = [f"{label}: подгружен модуль GUI {name}" for name in sorted(loaded) if name.split('.')[0] in FORBIDDEN]
+    status = "ок" if best / 1000 <= budget_ms else "ПРЕВЫШЕН"
+    print(f"{label:<40} {best / 1000:8.1f} мс  (бюджет {budget_ms:.0f} мс, {status})")
+    if best / 1000 > budget_ms:
+        problems.append(f"{label}: {best / 1000:.1f} мс больше бюджета {budget_ms:.0f} мс")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бюджет времени импорта ядра и пакетного режима")
+    parser.add_argument('--budget-ms', type=float, default=150.0, help="Максимальное время импорта одной цели (лучшее из --repeat)")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    problems = []
+    for module in TARGETS:
+        problems += check_target(f"import {module}", ['-c', f'import {module}'], module, args.budget_ms, args.repeat)
+    # У скрипта нет своей строки в выводе importtime: складываются все импорты верхнего уровня (вместе со стартом интерпретатора)
+    problems += check_target("SubtitleSplitter_1.1.0.py --help", [ENTRY_SCRIPT, '--help'], None, args.budget_ms, args.repeat)
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
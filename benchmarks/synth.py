@@ -0,0 +1,115 @@
+"""Генератор синтетических .ass скриптов для бенчмарков.
+
+Размер, число актеров, доли множественных ролей, исключений, строк 'гуры/все' и надписей,
+а также объем встроенных шрифтов задаются параметрами; при одном seed скрипт всегда одинаковый.
+
+Запуск из корня репозитория: python benchmarks/synth.py out.ass [--lines 100000] [--actors 40] [--fonts-mb 10]
+"""
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from subtitle_splitter.timecode import format_ass_time
+
+STYLES_FORMAT = ("Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, "
+                 "ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding")
+STYLE = "Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1"
+WRITE_CHUNK = 10000
+# Время строк укладывается в 9:50:00.00: у скриптов до 10 часов время однозначное H:MM:SS.cc,
+# как в настоящих эпизодах (и разбирается быстрым путем parse_ass_time, а не регулярным выражением)
+MAX_START = (9 * 3600 + 50 * 60) * 100
+MAX_GAP = 300
+
+class ScriptSpec:
+    """Параметры синтетического скрипта; доли задаются от общего числа строк Dialogue."""
+
+    def __init__(self, lines=10000, actors=20, multiple_ratio=0.05, exclusion_ratio=0.01, group_ratio=0.02, sign_ratio=0.05, fonts_mb=0, seed=1):
+        self.lines = lines
+        self.actors = actors
+        self.multiple_ratio = multiple_ratio
+        self.exclusion_ratio = exclusion_ratio
+        self.group_ratio = group_ratio
+        self.sign_ratio = sign_ratio
+        self.fonts_mb = fonts_mb
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+def parse_size(value):
+    """'1k', '250k', '1m' или число → количество строк."""
+    value = value.strip().lower()
+    for suffix, factor in (('k', 1000), ('m', 1000000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * factor)
+    return int(value)
+
+def _pick_name(rng, spec):
+    # Разделитель ';' — запятая в поле Name ломает разбор строки Dialogue
+    roll = rng.random()
+    if roll < spec.group_ratio:
+        return 'гуры'
+    roll -= spec.group_ratio
+    if roll < spec.sign_ratio:
+        return 'надпись'
+    roll -= spec.sign_ratio
+    if roll < spec.multiple_ratio:
+        return '; '.join(f"Актер {actor}" for actor in rng.sample(range(1, spec.actors + 1), min(2, spec.actors)))
+    roll -= spec.multiple_ratio
+    if roll < spec.exclusion_ratio:
+        return f"!Актер {rng.randint(1, spec.actors)}"
+    return f"Актер {rng.randint(1, spec.actors)}"
+
+def write_script(path, spec):
+    """Пишет скрипт по spec (ScriptSpec) в path и возвращает размер файла в байтах."""
+    rng = random.Random(spec.seed)
+    with open(path, 'w', encoding='utf-8-sig') as file:
+        file.write(f"[Script Info]\nTitle: bench\nScriptType: v4.00+\n\n[V4+ Styles]\n{STYLES_FORMAT}\n{STYLE}\n\n")
+        if spec.fonts_mb:
+            # uuencode в .ass: символы 33..96, строки по 80 символов
+            font_line = ''.join(chr(rng.randint(33, 96)) for _ in range(80)) + '\n'
+            file.write("[Fonts]\nfontname: bench_0.ttf\n")
+            file.write(font_line * int(spec.fonts_mb * 1024 * 1024 // len(font_line)))
+            file.write("\n")
+        file.write("[Events]\nFormat: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
+        start = 0
+        # В длинных скриптах промежуток между строками сокращается, чтобы время не дошло до 10 часов
+        max_gap = max(1, min(MAX_GAP, 2 * MAX_START // max(spec.lines, 1)))
+        chunk = []
+        for index in range(spec.lines):
+            start += rng.randint(0, max_gap)
+            end = start + rng.randint(50, 400)
+            chunk.append(f"Dialogue: 0,{format_ass_time(start)},{format_ass_time(end)},Default,{_pick_name(rng, spec)},0,0,0,,"
+                         f"{{\\i1}}Реплика номер {index}\\Nвторая строка{{\\i0}}\n")
+            if len(chunk) == WRITE_CHUNK:
+                file.write(''.join(chunk))
+                chunk.clear()
+        file.write(''.join(chunk))
+    return os.path.getsize(path)
+
+def add_spec_arguments(parser):
+    parser.add_argument('--actors', type=int, default=20)
+    parser.add_argument('--multiple-ratio', type=float, default=0.05, help="Доля строк с множественными ролями")
+    parser.add_argument('--exclusion-ratio', type=float, default=0.01, help="Доля строк-исключений (!Актер)")
+    parser.add_argument('--group-ratio', type=float, default=0.02, help="Доля строк 'гуры'")
+    parser.add_argument('--sign-ratio', type=float, default=0.05, help="Доля надписей")
+    parser.add_argument('--fonts-mb', type=float, default=0, help="Объем встроенных шрифтов [Fonts], МБ")
+    parser.add_argument('--seed', type=int, default=1)
+
+def spec_from_args(args, lines):
+    return ScriptSpec(lines, args.actors, args.multiple_ratio, args.exclusion_ratio, args.group_ratio, args.sign_ratio, args.fonts_mb, args.seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Генерация синтетического .ass скрипта")
+    parser.add_argument('output')
+    parser.add_argument('--lines', default='10k', help="Число строк Dialogue: 1000, 10k, 1m ...")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+    size = write_script(args.output, spec_from_args(args, parse_size(args.lines)))
+    print(f"{args.output}: {size / (1024 * 1024):.1f} МБ")
+
+if __name__ == '__main__':
+    main()
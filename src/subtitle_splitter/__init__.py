@@ -0,0 +1,11 @@
+"""Ядро разделения .ass субтитров по актерам без зависимостей от GUI."""
+from .core import iter_ass_file, parse_ass_file, classify_events, Classification, ActorIndex, split_events, split_by_actor, plan_output_files, OutputFile, merge_timeline, timeline_key, format_srt_time, save_ass_file, save_srt_file, save_actor_files, set_error_handler, filter_window, rebase_events
+from .batch import find_ass_files, split_file, run_batch, default_jobs
+from .events import Event
+from .writers import AssHeader, render_ass, render_srt, srt_text
+from .streaming import StreamPlan, stream_actor_files
+from .rules import NameRules, load_rules, default_rules, set_default_rules
+from .aliases import suggest_aliases, load_confirmed_aliases, save_confirmed_aliases
+from .metrics import RunMetrics, record_run, active_metrics, set_metrics
+from .timecode import parse_ass_time, format_ass_time, format_srt_cs, ass_to_srt_time, parse_clock
+from .timeline import IntervalIndex, ActorTimeline, build_timelines, timeline_report
@@ -0,0 +1,100 @@
+import os
+import json
+import logging
+from functools import lru_cache
+
+from .config import config_dir
+from .writers import write_atomic
+
+# Минимальная похожесть имен (difflib.SequenceMatcher.ratio) для предложения псевдонима
+SIMILARITY = 0.85
+
+_TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
+    'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch', 'ъ': '', 'ы': 'y', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+# Латинские варианты транслитерации, которые сводятся к тому же ключу
+_LATIN_VARIANTS = (('kh', 'h'), ('shch', 'sch'), ('iy', 'i'), ('yy', 'y'), ('j', 'i'))
+
+def aliases_path():
+    """Путь к подтвержденным псевдонимам в папке настроек."""
+    return os.path.join(config_dir(), 'aliases.json')
+
+@lru_cache(maxsize=None)
+def match_key(name):
+    """Ключ для сравнения написаний: без регистра, пробелов и знаков, кириллица в латинице."""
+    key = ''.join(char for char in name.casefold().translate(_TRANSLIT) if char.isalnum())
+    for variant, replacement in _LATIN_VARIANTS:
+        key = key.replace(variant, replacement)
+    return key
+
+def load_confirmed_aliases(path=None):
+    """Читает подтвержденные псевдонимы {написание: имя}; при ошибке — пустой словарь."""
+    path = path or aliases_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            aliases = json.load(file).get('aliases', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Не удалось прочитать псевдонимы из {path}: {e}")
+        return {}
+    return {alias: name for alias, name in aliases.items() if isinstance(alias, str) and isinstance(name, str)}
+
+def save_confirmed_aliases(new_aliases, path=None):
+    """Добавляет псевдонимы к сохраненным и возвращает итоговый словарь."""
+    path = path or aliases_path()
+    aliases = load_confirmed_aliases(path)
+    aliases.update(new_aliases)
+    write_atomic(path, json.dumps({'aliases': aliases}, ensure_ascii=False, indent=4, sort_keys=True).encode('utf-8'))
+    logging.info(f"Сохранено псевдонимов: {len(new_aliases)}, всего: {len(aliases)} ({path})")
+    return aliases
+
+def _digits(key):
+    return ''.join(char for char in key if char.isdigit())
+
+def suggest_aliases(line_counts):
+    """Предлагает объединить похожие написания актеров.
+
+    line_counts — {актер: число строк}. Возвращает список (написание, имя, похожесть): имя — самое
+    частое из похожих написаний. Группы похожих написаний кешируются по набору имен, поэтому для
+    эпизодов сезона с теми же актерами (и любым числом строк) они не ищутся заново.
+    """
+    suggestions = []
+    for group in _similar_groups(frozenset(line_counts)):
+        canonical = min(group, key=lambda name: (-line_counts[name], name))
+        canonical_key = match_key(canonical)
+        for name in sorted(group):
+            if name != canonical:
+                suggestions.append((name, canonical, _similarity(match_key(name), canonical_key)))
+    return suggestions
+
+@lru_cache(maxsize=64)
+def _similar_groups(names):
+    """Группы (кортежи из двух и более имен) похожих написаний среди names."""
+    import difflib
+    groups = {}
+    for name in sorted(names):
+        key = match_key(name)
+        if not key:
+            continue
+        if key not in groups:
+            # Цифры должны совпадать: 'Актер 1' и 'Актер 19' — разные люди, хотя написания похожи.
+            # Кандидаты отбираются до get_close_matches, чтобы они не вытеснили подходящее имя из выдачи
+            digits = _digits(key)
+            close = difflib.get_close_matches(key, [other for other in groups if _digits(other) == digits], n=1, cutoff=SIMILARITY)
+            if close:
+                key = close[0]
+            else:
+                groups[key] = []
+        groups[key].append(name)
+    return tuple(tuple(group) for group in groups.values() if len(group) > 1)
+
+@lru_cache(maxsize=None)
+def _similarity(key, other):
+    if key == other:
+        return 1.0
+    import difflib
+    return round(difflib.SequenceMatcher(None, key, other).ratio(), 2)
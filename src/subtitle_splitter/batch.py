@@ -0,0 +1,208 @@
+import os
+import glob
+import time
+import logging
+
+from .core import parse_ass_file, split_events, save_actor_files, rebase_events, DEFAULT_IO_WORKERS, WINDOW_LOOKAHEAD
+from .timecode import format_file_time
+from .metrics import record_run, active_metrics
+
+# Папка с результатами рядом с исходным файлом (как в GUI)
+OUTPUT_DIR_NAME = 'Subtitles_by_Actor'
+
+class SplitResult:
+    """Итог обработки одного файла: число актеров, записанные файлы и время фаз в секундах."""
+
+    def __init__(self, file_path, output_dir):
+        self.file_path = file_path
+        self.output_dir = output_dir
+        self.actor_count = 0
+        self.written = []
+        self.timings = {'parse': 0.0, 'split': 0.0, 'save': 0.0}
+        self.error = None
+        self.cached = False
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def total_time(self):
+        return sum(self.timings.values())
+
+def _is_output_path(path):
+    """Проверяет, лежит ли файл в папке с результатами предыдущего разделения."""
+    return os.path.basename(os.path.dirname(os.path.abspath(path))) == OUTPUT_DIR_NAME
+
+def find_ass_files(paths):
+    """Раскрывает файлы, папки (рекурсивно) и glob-шаблоны в список .ass файлов без повторов."""
+    found = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if d != OUTPUT_DIR_NAME)
+                candidates.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.lower().endswith('.ass'))
+        elif glob.has_magic(path):
+            candidates = [p for p in sorted(glob.glob(path, recursive=True)) if os.path.isfile(p) and not _is_output_path(p)]
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            key = os.path.normcase(os.path.abspath(candidate))
+            if key not in seen:
+                seen.add(key)
+                found.append(candidate)
+    logging.info(f"Найдено .ass файлов для обработки: {len(found)}")
+    return found
+
+# Дисковый кеш разбора для пакетного режима: один на процесс, без хранения в памяти
+_disk_cache = None
+
+def _get_disk_cache():
+    global _disk_cache
+    if _disk_cache is None:
+        from .cache import ParsedFileCache
+        _disk_cache = ParsedFileCache(max_bytes=0, disk=True)
+    return _disk_cache
+
+def split_file(file_path, export_format='ass', distribute_group=True, distribute_multiple=True, save_signs_ass=True, use_cache=False, incremental=False, stream=False, io_workers=DEFAULT_IO_WORKERS, bundle=None, compress=False,
+               report=False, profile=None, window=None, rebase=False, full_scan=False):
+    """Выполняет parse_ass_file → split_by_actor → save_actor_files для одного файла.
+
+    При use_cache=True результат разбора берется из дискового кеша в папке настроек (или сохраняется туда).
+    При incremental=True перезаписываются только файлы актеров, содержимое которых изменилось.
+    При stream=True файл обрабатывается потоково (streaming.stream_actor_files) с постоянной памятью;
+    кеш разбора и инкрементальный режим при этом не используются.
+    io_workers — число потоков записи выходных файлов; bundle ('zip' или 'tar') и compress —
+    сохранение всех файлов эпизода одним архивом.
+    При report=True таймеры и счетчики фаз (metrics.RunMetrics) сохраняются в JSON-отчет
+    в папке с результатами; profile ('cpu' или 'memory') добавляет в него профиль cProfile или tracemalloc.
+    window — (start, end) в сантисекундах (None — без границы): разбираются и сохраняются только строки
+    этого отрезка, к имени эпизода добавляется отрезок; rebase=True сдвигает их время так, чтобы отрезок
+    начинался с нуля, full_scan=True читает файл до конца даже по отсортированным строкам.
+    С кешем и потоковым режимом window не сочетается.
+    """
+    original_filename = os.path.splitext(os.path.basename(file_path))[0]
+    output_dir = os.path.join(os.path.dirname(file_path), OUTPUT_DIR_NAME)
+    if window is not None:
+        original_filename += f" [{window_label(*window)}]"
+    if not report and profile is None:
+        return _split_file(file_path, original_filename, output_dir, export_format, distribute_group, distribute_multiple, save_signs_ass,
+                           use_cache, incremental, stream, io_workers, bundle, compress, window, rebase, full_scan)
+    summary = {}
+    with record_run(output_dir, original_filename, report, profile, summary):
+        result = _split_file(file_path, original_filename, output_dir, export_format, distribute_group, distribute_multiple, save_signs_ass,
+                             use_cache, incremental, stream, io_workers, bundle, compress, window, rebase, full_scan)
+        summary['result'] = {'ok': result.ok, 'error': result.error, 'actors': result.actor_count, 'files': len(result.written),
+                             'cached': result.cached, 'timings_ms': {phase: round(seconds * 1000, 3) for phase, seconds in result.timings.items()}}
+    return result
+
+def window_label(start, end):
+    """Отрезок для имени файла: '0.12.30-0.15.10', без границы — 'начало' или 'конец'."""
+    return f"{format_file_time(start) if start is not None else 'начало'}-{format_file_time(end) if end is not None else 'конец'}"
+
+def _split_file(file_path, original_filename, output_dir, export_format, distribute_group, distribute_multiple, save_signs_ass, use_cache, incremental, stream, io_workers, bundle, compress,
+                window=None, rebase=False, full_scan=False):
+    result = SplitResult(file_path, output_dir)
+    if not os.path.isfile(file_path):
+        result.error = "Файл не существует"
+        return result
+
+    if stream:
+        from .streaming import StreamPlan, stream_actor_files
+        started = time.perf_counter()
+        with active_metrics().phase('parse'):
+            plan = StreamPlan().scan(file_path)
+        result.timings['parse'] = time.perf_counter() - started
+        result.actor_count = len(plan.actor_names())
+        started = time.perf_counter()
+        with active_metrics().phase('write'):
+            written = stream_actor_files(file_path, output_dir, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass, plan=plan)
+        result.timings['save'] = time.perf_counter() - started
+        if written is None:
+            result.error = "Не удалось распарсить файл или разделить его по актерам"
+            return result
+        result.written = written
+        return result
+
+    if use_cache:
+        started = time.perf_counter()
+        parsed, result.cached = _get_disk_cache().load(file_path)
+        result.timings['parse'] = time.perf_counter() - started
+        if parsed is None:
+            result.error = "Не удалось распарсить файл или разделить его по актерам"
+            return result
+        headers, styles, classification = parsed.headers, parsed.styles, parsed.classification
+    else:
+        started = time.perf_counter()
+        headers, styles, events = parse_ass_file(file_path, window=window, lookahead=None if full_scan else WINDOW_LOOKAHEAD)
+        result.timings['parse'] = time.perf_counter() - started
+        if headers is None or styles is None or events is None:
+            result.error = "Не удалось распарсить файл или нет строк Dialogue" + (" в выбранном отрезке" if window is not None else "")
+            return result
+        if rebase and window is not None and window[0]:
+            events = rebase_events(events, window[0])
+
+        started = time.perf_counter()
+        classification = split_events(events)
+        result.timings['split'] = time.perf_counter() - started
+        if classification is None:
+            result.error = "Не найдено актеров, событий или надписей"
+            return result
+    result.actor_count = len(classification.actors)
+
+    started = time.perf_counter()
+    written = save_actor_files(headers, styles, classification.actors, classification.group_lines, classification.multiple_actor_lines, classification.excluded_actor_groups,
+                               classification.sign_lines, output_dir, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass,
+                               classification.all_actors, actor_index=classification.actor_index, incremental=incremental, io_workers=io_workers, bundle=bundle, compress=compress)
+    result.timings['save'] = time.perf_counter() - started
+    if written is None:
+        result.error = f"Не удалось записать файлы в папку {output_dir}"
+        return result
+    result.written = written
+    return result
+
+def _split_file_safe(file_path, options):
+    """Обертка split_file, превращающая исключения в SplitResult с ошибкой (в том числе в дочернем процессе)."""
+    try:
+        return split_file(file_path, **options)
+    except Exception as e:
+        logging.error(f"Ошибка при обработке файла {file_path}: {e}")
+        result = SplitResult(file_path, os.path.join(os.path.dirname(file_path), OUTPUT_DIR_NAME))
+        result.error = str(e)
+        return result
+
+def _init_worker(log_level):
+    """Настраивает логирование в дочернем процессе так же, как в родительском."""
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def default_jobs():
+    """Число рабочих процессов по умолчанию: все доступные ядра."""
+    return os.cpu_count() or 1
+
+def run_batch(file_paths, jobs=1, **options):
+    """Обрабатывает файлы не более чем в jobs процессах, отдавая SplitResult по мере готовности."""
+    jobs = max(1, min(jobs, len(file_paths)))
+    if jobs == 1:
+        for file_path in file_paths:
+            yield _split_file_safe(file_path, options)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    logging.info(f"Запуск пула из {jobs} процессов для {len(file_paths)} файлов")
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+        futures = {executor.submit(_split_file_safe, file_path, options): file_path for file_path in file_paths}
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    file_path = futures[future]
+                    logging.error(f"Рабочий процесс упал при обработке {file_path}: {e}")
+                    result = SplitResult(file_path, os.path.join(os.path.dirname(file_path), OUTPUT_DIR_NAME))
+                    result.error = str(e)
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
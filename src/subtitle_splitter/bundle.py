@@ -0,0 +1,68 @@
+import io
+import json
+import time
+
+from .rules import KIND_ACTOR
+
+# Форматы архива (--bundle); tarfile и zipfile импортируются только при записи архива,
+# чтобы core, который берет отсюда список форматов, не подгружал их при каждом запуске
+BUNDLE_FORMATS = ('zip', 'tar')
+INDEX_NAME = 'index.json'
+
+def bundle_file_name(original_filename, bundle, compress):
+    if bundle == 'tar':
+        return f"{original_filename} - Актеры.tar" + ('.gz' if compress else '')
+    return f"{original_filename} - Актеры.zip"
+
+def bundle_index(outputs, original_filename):
+    """Оглавление архива: файлы с видом, подписью и числом строк, а также число строк по актерам."""
+    return {
+        'source': original_filename,
+        'files': [{'file': output.file_name, 'kind': output.kind, 'label': output.label, 'lines': len(output.events)} for output in outputs],
+        'actors': {output.label: len(output.events) for output in outputs if output.kind == KIND_ACTOR},
+    }
+
+class BundleWriter:
+    """Последовательная запись файлов в один .zip или .tar архив (в файловый объект)."""
+
+    def __init__(self, file, bundle, compress):
+        import tarfile
+        import zipfile
+        self.bundle = bundle
+        self.mtime = time.time()
+        if bundle == 'tar':
+            self.archive = tarfile.open(fileobj=file, mode='w:gz' if compress else 'w')
+        else:
+            self.archive = zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+
+    def add(self, name, data):
+        import tarfile
+        import zipfile
+        if self.bundle == 'tar':
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self.mtime
+            self.archive.addfile(info, io.BytesIO(data))
+        else:
+            info = zipfile.ZipInfo(name, time.localtime(self.mtime)[:6])
+            info.compress_type = self.archive.compression
+            self.archive.writestr(info, data)
+
+    def close(self):
+        self.archive.close()
+
+def write_bundle(file, outputs, render, bundle, compress, index, progress=None, cancel_event=None):
+    """Пишет outputs (содержимое — render(output)) и INDEX_NAME в архив; False, если запись отменена."""
+    writer = BundleWriter(file, bundle, compress)
+    try:
+        total = len(outputs)
+        for done, output in enumerate(outputs):
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            writer.add(output.file_name, render(output))
+            if progress is not None:
+                progress(done + 1, total)
+        writer.add(INDEX_NAME, json.dumps(index, ensure_ascii=False, indent=1).encode('utf-8'))
+    finally:
+        writer.close()
+    return True
@@ -0,0 +1,176 @@
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .config import config_dir
+from .core import parse_ass_file, split_events
+from .rules import default_rules
+
+# Версия формата дискового кеша: меняется вместе со структурой Event/Classification
+CACHE_VERSION = 4
+# Оценка памяти под разобранный файл относительно его размера на диске
+MEMORY_FACTOR = 6
+
+class ParsedScript:
+    """Разобранный и классифицированный файл: заголовки, стили, события и Classification."""
+    __slots__ = ('headers', 'styles', 'events', 'classification')
+
+    def __init__(self, headers, styles, events, classification):
+        self.headers = headers
+        self.styles = styles
+        self.events = events
+        self.classification = classification
+
+def cache_key(file_path):
+    """Ключ кеша: (реальный путь, mtime_ns, размер, отпечаток правил Name).
+
+    Любое изменение файла или правил разбора в settings.json дает новый ключ.
+    """
+    real_path = os.path.realpath(file_path)
+    stat = os.stat(real_path)
+    return real_path, stat.st_mtime_ns, stat.st_size, default_rules().fingerprint
+
+class ParsedFileCache:
+    """LRU-кеш результатов parse_ass_file + split_events с ограничением памяти и необязательным дисковым кешем.
+
+    В памяти хранится не больше max_bytes (оценка: размер файла × MEMORY_FACTOR), самые давние
+    записи вытесняются. Дисковый кеш — pickle-файлы в папке настроек (config_dir()/cache), общий
+    для всех запусков и рабочих процессов; его размер ограничен max_disk_bytes.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk=False, max_disk_bytes=512 * 1024 * 1024, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.max_disk_bytes = max_disk_bytes
+        self._cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self):
+        if self._cache_dir is None:
+            self._cache_dir = os.path.join(config_dir(), 'cache')
+        os.makedirs(self._cache_dir, exist_ok=True)
+        return self._cache_dir
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(key[0].encode('utf-8', 'surrogatepass')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def _remember(self, key, parsed):
+        cost = key[2] * MEMORY_FACTOR
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._used_bytes -= old[1]
+            self._entries[key] = (parsed, cost)
+            self._used_bytes += cost
+            while self._used_bytes > self.max_bytes:
+                evicted_key, (evicted, evicted_cost) = self._entries.popitem(last=False)
+                self._used_bytes -= evicted_cost
+                logging.info(f"Из кеша вытеснен файл: {evicted_key[0]}")
+
+    def _load_from_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as file:
+                version, stored_key, parsed = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Не удалось прочитать дисковый кеш {path}: {e}")
+            return None
+        if version != CACHE_VERSION or tuple(stored_key) != key:
+            return None
+        return parsed
+
+    def _store_on_disk(self, key, parsed):
+        path = self._disk_path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    pickle.dump((CACHE_VERSION, key, parsed), file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            self._prune_disk()
+        except Exception as e:
+            logging.warning(f"Не удалось записать дисковый кеш {path}: {e}")
+
+    def _prune_disk(self):
+        """Удаляет самые старые pickle-файлы, пока кеш на диске больше max_disk_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pickle'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def get(self, file_path):
+        """Возвращает ParsedScript из памяти или с диска, либо None."""
+        return self._get(cache_key(file_path))
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        if self.disk:
+            parsed = self._load_from_disk(key)
+            if parsed is not None:
+                self._remember(key, parsed)
+                self.hits += 1
+                return parsed
+        self.misses += 1
+        return None
+
+    def put(self, file_path, parsed):
+        self._put(cache_key(file_path), parsed)
+
+    def _put(self, key, parsed):
+        self._remember(key, parsed)
+        if self.disk:
+            self._store_on_disk(key, parsed)
+
+    def load(self, file_path):
+        """Возвращает (ParsedScript или None, взято ли из кеша); при промахе парсит и классифицирует файл."""
+        key = cache_key(file_path)
+        parsed = self._get(key)
+        if parsed is not None:
+            logging.info(f"Файл взят из кеша: {file_path}")
+            return parsed, True
+        headers, styles, events = parse_ass_file(file_path)
+        if headers is None or styles is None or events is None:
+            return None, False
+        classification = split_events(events)
+        if classification is None:
+            return None, False
+        parsed = ParsedScript(headers, styles, events, classification)
+        self._put(key, parsed)
+        return parsed, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._used_bytes = 0
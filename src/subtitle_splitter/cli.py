@@ -0,0 +1,175 @@
+import sys
+import time
+import logging
+import argparse
+
+from .batch import find_ass_files, run_batch, default_jobs
+from .core import DEFAULT_IO_WORKERS, parse_ass_file, classify_events
+from .bundle import BUNDLE_FORMATS
+from .aliases import suggest_aliases, save_confirmed_aliases, aliases_path
+from .rules import set_default_rules
+from .timecode import parse_clock
+
+def clock_time(value):
+    try:
+        return parse_clock(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"некорректное время: {value!r}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='subtitle_splitter',
+        description="Пакетное разделение .ass субтитров по актерам без графического интерфейса."
+    )
+    parser.add_argument('paths', nargs='+', help="Файлы .ass, папки (обходятся рекурсивно) или glob-шаблоны, например 'Сезон/**/*.ass'")
+    parser.add_argument('-f', '--format', dest='export_format', choices=['ass', 'srt'], default='ass', help="Формат сохранения (по умолчанию ass)")
+    parser.add_argument('--no-distribute-group', dest='distribute_group', action='store_false', help="Не распределять строки 'гуры/все', а сохранять их отдельным файлом")
+    parser.add_argument('--no-distribute-multiple', dest='distribute_multiple', action='store_false', help="Не распределять множественные роли и исключения по актерам")
+    parser.add_argument('--no-signs-ass', dest='save_signs_ass', action='store_false', help="Не сохранять надписи в отдельный .ass файл")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Число параллельных процессов (по умолчанию — все ядра, 1 — без пула)")
+    parser.add_argument('--io-workers', type=int, default=DEFAULT_IO_WORKERS, help=f"Число потоков записи файлов одного эпизода (по умолчанию {DEFAULT_IO_WORKERS}); больше — быстрее на сетевых папках")
+    parser.add_argument('--bundle', choices=BUNDLE_FORMATS, default=None, help="Сохранять все файлы эпизода одним архивом с оглавлением index.json вместо отдельных файлов")
+    parser.add_argument('--compress', action='store_true', help="Сжимать архив --bundle (deflate для zip, gzip для tar)")
+    parser.add_argument('--cache', dest='use_cache', action='store_true', help="Использовать дисковый кеш разбора в папке настроек: повторный запуск по тем же файлам не парсит их заново")
+    parser.add_argument('--incremental', action='store_true', help="Перезаписывать только файлы актеров, чьи строки изменились с прошлого запуска, и удалять устаревшие")
+    parser.add_argument('--stream', action='store_true', help="Потоковая обработка с постоянной памятью для очень длинных скриптов (строки пишутся в порядке исходного файла; несовместимо с --cache и --incremental)")
+    parser.add_argument('--report', action='store_true', help="Сохранять JSON-отчет с временем фаз, счетчиками и задержками записи в папку с результатами (.<эпизод>.report.json)")
+    parser.add_argument('--profile', choices=['cpu', 'memory'], default=None, help="Добавить в отчет профиль: cpu — cProfile (также .<эпизод>.prof), memory — tracemalloc")
+    parser.add_argument('--from', dest='window_start', type=clock_time, default=None, metavar='ВРЕМЯ', help="Обрабатывать только строки начиная с этого времени (750, 12:30 или 0:12:30.5)")
+    parser.add_argument('--to', dest='window_end', type=clock_time, default=None, metavar='ВРЕМЯ', help="Обрабатывать только строки до этого времени; в отсортированном файле разбор останавливается после отрезка")
+    parser.add_argument('--rebase', action='store_true', help="Вместе с --from: сдвинуть время строк так, чтобы отрезок начинался с нуля (например, для .srt в REAPER)")
+    parser.add_argument('--full-scan', action='store_true', help="Вместе с --from/--to: читать файл до конца, даже если строки идут по времени (если строки отрезка, например надписи, могут быть в конце файла)")
+    parser.add_argument('--timeline', action='store_true', help="Только вывести отчет по таймингу: время речи актеров, наложения их строк, пересечения с 'гуры/все' и самые загруженные отрезки")
+    parser.add_argument('--timeline-window', type=int, default=60, metavar='СЕКУНДЫ', help="Длина отрезка для поиска самых загруженных мест в отчете --timeline (по умолчанию 60 секунд)")
+    parser.add_argument('--suggest-aliases', action='store_true', help="Только найти похожие написания актеров во всех файлах и вывести предлагаемые псевдонимы")
+    parser.add_argument('--save-aliases', action='store_true', help="Вместе с --suggest-aliases: сохранить предложенные псевдонимы в aliases.json в папке настроек")
+    parser.add_argument('--add-alias', action='append', default=[], metavar='ПСЕВДОНИМ=ИМЯ', help="Сохранить псевдоним актера перед обработкой (можно указать несколько раз)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Подробное логирование")
+    return parser
+
+def format_result(position, total, result):
+    """Формирует строку итога по одному файлу."""
+    prefix = f"[{position:>{len(str(total))}}/{total}] {result.file_path}"
+    if not result.ok:
+        return f"{prefix}: ОШИБКА: {result.error}"
+    timings = result.timings
+    return (f"{prefix}: актеров {result.actor_count}, файлов {len(result.written)}, "
+            f"парсинг {timings['parse'] * 1000:.1f} мс, разделение {timings['split'] * 1000:.1f} мс, "
+            f"запись {timings['save'] * 1000:.1f} мс" + (" (разбор из кеша)" if result.cached else ""))
+
+def parse_alias(value):
+    alias, separator, name = value.partition('=')
+    if not separator or not alias.strip() or not name.strip():
+        return None
+    return alias.strip(), name.strip()
+
+def collect_actor_lines(file_paths):
+    """Число строк каждого актера по всем файлам (для поиска похожих написаний)."""
+    line_counts = {}
+    for file_path in file_paths:
+        headers, styles, events = parse_ass_file(file_path)
+        if events is None:
+            continue
+        for actor, lines in classify_events(events).actors.items():
+            line_counts[actor] = line_counts.get(actor, 0) + len(lines)
+    return line_counts
+
+def print_timelines(file_paths, window_seconds):
+    from .timeline import timeline_report, format_timeline_report
+    failed = 0
+    for position, file_path in enumerate(file_paths, 1):
+        print(f"[{position}/{len(file_paths)}] {file_path}")
+        headers, styles, events = parse_ass_file(file_path)
+        if events is None:
+            print("  ОШИБКА: не удалось распарсить файл или нет строк Dialogue")
+            failed += 1
+            continue
+        report = timeline_report(classify_events(events), window=window_seconds * 100)
+        print(format_timeline_report(report) or "  Актеров не найдено.")
+    return 1 if failed else 0
+
+def print_suggestions(file_paths, save):
+    suggestions = suggest_aliases(collect_actor_lines(file_paths))
+    if not suggestions:
+        print("Похожих написаний актеров не найдено.")
+        return 0
+    for name, canonical, score in suggestions:
+        print(f"'{name}' -> '{canonical}' (похожесть {score:.2f})")
+    if save:
+        save_confirmed_aliases({name: canonical for name, canonical, _ in suggestions})
+        print(f"Псевдонимы сохранены: {aliases_path()}")
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.stream and (args.use_cache or args.incremental or args.bundle):
+        parser.error("--stream нельзя сочетать с --cache, --incremental и --bundle")
+    if args.bundle and args.incremental:
+        parser.error("--bundle нельзя сочетать с --incremental")
+    if args.compress and not args.bundle:
+        parser.error("--compress используется только вместе с --bundle")
+    window = None
+    if args.window_start is not None or args.window_end is not None:
+        if args.stream or args.use_cache:
+            parser.error("--from/--to нельзя сочетать с --stream и --cache")
+        if args.window_start is not None and args.window_end is not None and args.window_end <= args.window_start:
+            parser.error("Время --to должно быть больше --from")
+        window = (args.window_start, args.window_end)
+    if args.rebase and args.window_start is None:
+        parser.error("--rebase используется только вместе с --from")
+    if args.full_scan and window is None:
+        parser.error("--full-scan используется только вместе с --from/--to")
+    if args.save_aliases and not args.suggest_aliases:
+        parser.error("--save-aliases используется только вместе с --suggest-aliases")
+    new_aliases = [parse_alias(value) for value in args.add_alias]
+    if None in new_aliases:
+        parser.error("--add-alias ожидает значение вида ПСЕВДОНИМ=ИМЯ")
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)]
+    )
+
+    if new_aliases:
+        save_confirmed_aliases(dict(new_aliases))
+        set_default_rules(None)
+
+    file_paths = find_ass_files(args.paths)
+    if not file_paths:
+        print("Не найдено .ass файлов для обработки.", file=sys.stderr)
+        return 2
+
+    if args.suggest_aliases:
+        return print_suggestions(file_paths, args.save_aliases)
+    if args.timeline:
+        if args.timeline_window < 1:
+            print("Длина отрезка --timeline-window должна быть не меньше 1 секунды.", file=sys.stderr)
+            return 2
+        return print_timelines(file_paths, args.timeline_window)
+
+    jobs = args.jobs if args.jobs is not None else default_jobs()
+    if jobs < 1:
+        print("Число процессов --jobs должно быть не меньше 1.", file=sys.stderr)
+        return 2
+
+    if args.io_workers < 1:
+        print("Число потоков --io-workers должно быть не меньше 1.", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    failed = 0
+    written = 0
+    for position, result in enumerate(run_batch(file_paths, jobs=jobs, export_format=args.export_format, distribute_group=args.distribute_group,
+                                                distribute_multiple=args.distribute_multiple, save_signs_ass=args.save_signs_ass, use_cache=args.use_cache,
+                                                incremental=args.incremental, stream=args.stream, io_workers=args.io_workers,
+                                                bundle=args.bundle, compress=args.compress, report=args.report, profile=args.profile,
+                                                window=window, rebase=args.rebase, full_scan=args.full_scan), 1):
+        print(format_result(position, len(file_paths), result), flush=True)
+        if result.ok:
+            written += len(result.written)
+        else:
+            failed += 1
+    elapsed = time.perf_counter() - started
+    print(f"Готово: файлов {len(file_paths)}, ошибок {failed}, записано {written}, процессов {min(jobs, len(file_paths))}, время {elapsed:.2f} с")
+    return 1 if failed else 0
@@ -0,0 +1,16 @@
+import os
+import sys
+
+def config_dir():
+    """Возвращает папку настроек SubtitleSplitter в пользовательской директории, создавая ее при необходимости."""
+    if sys.platform.startswith('win'):
+        base_path = os.getenv('APPDATA') or os.path.expanduser('~')
+    else:
+        base_path = os.path.expanduser('~/.config')
+    path = os.path.join(base_path, 'SubtitleSplitter')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def settings_path():
+    """Возвращает путь к settings.json в пользовательской директории."""
+    return os.path.join(config_dir(), 'settings.json')
@@ -0,0 +1,665 @@
+import os
+import time
+import heapq
+import logging
+import re
+from operator import attrgetter
+
+from .events import Event
+from .timecode import ass_to_srt_time
+from .aliases import suggest_aliases
+from .bundle import BUNDLE_FORMATS
+from .metrics import active_metrics
+from .rules import default_rules, KIND_ACTOR, KIND_MULTIPLE, KIND_EXCLUDED, KIND_GROUP, KIND_SIGN
+from .writers import AssHeader, iter_ass_blocks, render_ass, render_srt, write_bytes
+
+# Обработчик сообщений об ошибках для пользователя. Ядро не зависит от tkinter:
+# GUI подставляет сюда messagebox.showerror, в пакетном режиме ошибки только логируются.
+_error_handler = None
+
+def set_error_handler(handler):
+    """Устанавливает функцию показа ошибок пользователю: handler(title, message)."""
+    global _error_handler
+    _error_handler = handler
+
+def show_error(title, message):
+    """Передает сообщение об ошибке установленному обработчику, если он задан."""
+    if _error_handler is not None:
+        _error_handler(title, message)
+
+# Скрипты, в которых встроенные шрифты и картинки занимают от стольких байт, разбираются через mmap:
+# он пропускает вложения, не декодируя их. Без вложений построчный разбор не медленнее (bench_parser.py)
+MMAP_MIN_ATTACHMENTS = 1024 * 1024
+
+def iter_ass_file(file_path, headers, styles, backend='auto'):
+    """Лениво отдает события Event из секции [Events], попутно заполняя списки headers и styles.
+
+    backend: 'text' — построчное чтение, 'mmap' — mapped.iter_mapped_events,
+    'auto' — mmap, если секции [Fonts] и [Graphics] вместе занимают от MMAP_MIN_ATTACHMENTS байт.
+    """
+    if backend == 'auto':
+        backend = 'text'
+        if os.path.getsize(file_path) >= MMAP_MIN_ATTACHMENTS:
+            from .mapped import attachment_size
+            if attachment_size(file_path, MMAP_MIN_ATTACHMENTS) >= MMAP_MIN_ATTACHMENTS:
+                backend = 'mmap'
+    if backend == 'mmap':
+        from .mapped import iter_mapped_events
+        return iter_mapped_events(file_path, headers, styles)
+    return _iter_text_events(file_path, headers, styles)
+
+def _iter_text_events(file_path, headers, styles):
+    current_section = None
+    index = 0
+    with open(file_path, 'r', encoding='utf-8-sig') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('['):
+                current_section = line
+                continue
+            if current_section == '[Script Info]':
+                headers.append(line)
+            elif current_section == '[V4+ Styles]':
+                styles.append(line)
+            elif current_section == '[Events]':
+                if line.startswith('Dialogue:'):
+                    event = Event.parse(line, index)
+                    if event is None:
+                        logging.warning(f"Пропущена некорректная строка: {line}")
+                        continue
+                    index += 1
+                    yield event
+
+# Сколько строк подряд после конца отрезка должен увидеть filter_window в отсортированном файле,
+# чтобы прекратить разбор: одиночные строки не по порядку (например, надписи) не обрывают его раньше времени
+WINDOW_LOOKAHEAD = 200
+
+def filter_window(events, start=None, end=None, lookahead=WINDOW_LOOKAHEAD):
+    """Отдает события, пересекающиеся с отрезком [start, end) в сантисекундах (None — без границы).
+
+    Пока события идут по возрастанию времени начала, разбор прекращается после lookahead строк
+    подряд, начинающихся не раньше end. Если до этого встретилась строка не по порядку, файл
+    читается до конца: в неотсортированном [Events] строка отрезка может оказаться где угодно.
+    lookahead=None отключает раннюю остановку.
+    """
+    previous = None
+    in_order = True
+    past_end = 0
+    for event in events:
+        if previous is not None and event.start < previous:
+            in_order = False
+        previous = event.start
+        if end is not None and event.start >= end:
+            past_end += 1
+            if in_order and lookahead is not None and past_end >= lookahead:
+                logging.info(f"Разбор остановлен после конца отрезка на строке {event.index + 1}")
+                return
+            continue
+        past_end = 0
+        if start is None or event.end > start:
+            yield event
+
+def rebase_events(events, offset):
+    """Копии событий со временем, сдвинутым на offset сантисекунд назад (не раньше нуля)."""
+    return [Event(event.index, event.layer, max(event.start - offset, 0), max(event.end - offset, 0), event.style, event.name,
+                  event.margin_l, event.margin_r, event.margin_v, event.effect, event.text) for event in events]
+
+def parse_ass_file(file_path, backend='auto', window=None, lookahead=WINDOW_LOOKAHEAD):
+    """Разбирает файл в (headers, styles, events); (None, None, None) при ошибке.
+
+    window — (start, end) в сантисекундах: берутся только строки этого отрезка (filter_window
+    с lookahead).
+    """
+    logging.info(f"Начало парсинга файла: {file_path}")
+    headers = []
+    styles = []
+    metrics = active_metrics()
+    try:
+        with metrics.phase('parse'):
+            events_iter = iter_ass_file(file_path, headers, styles, backend)
+            try:
+                events = list(filter_window(events_iter, *window, lookahead) if window is not None else events_iter)
+            finally:
+                events_iter.close()
+        metrics.count('bytes_read', os.path.getsize(file_path))
+        if not events:
+            if window is not None:
+                logging.warning("Не найдено событий в выбранном отрезке")
+                show_error("Ошибка", "В выбранном отрезке нет строк Dialogue.")
+                return None, None, None
+            logging.warning("Не найдено событий в секции [Events]")
+            show_error("Ошибка", "В файле не найдено строк Dialogue.")
+            return None, None, None
+        logging.info(f"Успешно распарсено: {len(events)} событий")
+        return headers, styles, events
+    except Exception as e:
+        logging.error(f"Ошибка при парсинге файла {file_path}: {e}")
+        show_error("Ошибка", f"Не удалось распарсить файл {file_path}: {e}")
+        return None, None, None
+
+def parse_name_field(actor_field, rules=None):
+    """Разбирает поле Name в (вид строки, список актеров, актеры для all_actors) по правилам rules.NameRules."""
+    return (rules or default_rules()).parse(actor_field)
+
+class ActorIndex:
+    """Обратный индекс для распределения: актер → номера его строк с множественными ролями
+    и ключи групп исключений, в которых он указан.
+
+    Позволяет собрать файл актера поиском по индексу вместо перебора всех строк для каждого актера.
+    """
+
+    def __init__(self):
+        self.multiple = {}
+        self.excluded = {}
+
+    def add_multiple(self, position, actors_list):
+        for actor in dict.fromkeys(actors_list):
+            self.multiple.setdefault(actor, []).append(position)
+
+    def add_excluded(self, excluded_key):
+        for actor in excluded_key:
+            self.excluded.setdefault(actor, set()).add(excluded_key)
+
+    @classmethod
+    def build(cls, multiple_actor_lines, excluded_actor_groups):
+        index = cls()
+        for position, (event, actors_list) in enumerate(multiple_actor_lines):
+            index.add_multiple(position, actors_list)
+        for excluded_key in excluded_actor_groups:
+            index.add_excluded(excluded_key)
+        return index
+
+    def multiple_lines_for(self, actor, multiple_actor_lines):
+        """Строки с множественными ролями, где есть актер, в исходном порядке."""
+        return [multiple_actor_lines[position][0] for position in self.multiple.get(actor, ())]
+
+    def excluded_lines_for(self, actor, excluded_actor_groups):
+        """Строки всех групп исключений, которые не исключают актера."""
+        excluding = self.excluded.get(actor, ())
+        lines = []
+        for excluded_key, events in excluded_actor_groups.items():
+            if excluded_key not in excluding:
+                lines.extend(events)
+        return lines
+
+class Classification:
+    """Корзины строк после однопроходной классификации: актеры, гуры/все, множественные роли, исключения, надписи."""
+
+    def __init__(self):
+        self.actors = {}
+        self.group_lines = []
+        self.multiple_actor_lines = []
+        self.excluded_actor_groups = {}
+        self.sign_lines = []
+        self.all_actors = set()
+        self.actor_index = ActorIndex()
+        self.event_count = 0
+
+    @property
+    def is_empty(self):
+        return not self.actors and not self.group_lines and not self.multiple_actor_lines and not self.excluded_actor_groups and not self.sign_lines
+
+    def as_tuple(self):
+        """Возвращает результат в формате split_by_actor."""
+        return (self.actors, self.group_lines, self.multiple_actor_lines, self.excluded_actor_groups, self.sign_lines,
+                bool(self.group_lines), bool(self.multiple_actor_lines), bool(self.excluded_actor_groups), bool(self.sign_lines), self.all_actors)
+
+def classify_events(events, rules=None):
+    """Раскладывает события по корзинам за один проход.
+
+    events может быть генератором (например, iter_ass_file). Принимаются объекты Event и, для
+    совместимости, сырые строки Dialogue. Поле Name разбирается по rules (по умолчанию — правила
+    из settings.json), разбор кешируется, так как одни и те же значения повторяются по всему файлу.
+    """
+    rules = rules or default_rules()
+    result = Classification()
+    with active_metrics().phase('classify'):
+        _classify_into(result, events, rules)
+    _count_buckets(result)
+    return result
+
+def _count_buckets(result):
+    metrics = active_metrics()
+    metrics.count('events', result.event_count)
+    metrics.count('lines.actor', sum(map(len, result.actors.values())))
+    metrics.count('lines.group', len(result.group_lines))
+    metrics.count('lines.multiple', len(result.multiple_actor_lines))
+    metrics.count('lines.excluded', sum(map(len, result.excluded_actor_groups.values())))
+    metrics.count('lines.sign', len(result.sign_lines))
+    metrics.count('actors', len(result.actors))
+
+def _classify_into(result, events, rules):
+    actors = result.actors
+    excluded_actor_groups = result.excluded_actor_groups
+    all_actors = result.all_actors
+    name_cache = {}
+    # Проверяется один раз: даже ленивый logging.debug на каждую строку заметен на больших скриптах
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    for event in events:
+        try:
+            if isinstance(event, str):
+                line = event
+                event = Event.parse(line, result.event_count)
+                if event is None:
+                    logging.warning(f"Пропущена некорректная строка: {line}")
+                    continue
+            result.event_count += 1
+            actor_field = event.name
+            parsed = name_cache.get(actor_field)
+            if parsed is None:
+                parsed = name_cache[actor_field] = rules.parse(actor_field)
+                all_actors.update(parsed[2])
+            kind, actors_list, _ = parsed
+            if kind == KIND_ACTOR:
+                actor = actors_list[0]
+                if actor not in actors:
+                    actors[actor] = []
+                actors[actor].append(event)
+                if debug:
+                    logging.debug("Добавлено событие для актера %s: %s", actor, event)
+            elif kind == KIND_GROUP:
+                result.group_lines.append(event)
+                if debug:
+                    logging.debug("Найдена строка 'гуры/все': %s", event)
+            elif kind == KIND_SIGN:
+                result.sign_lines.append(event)
+                if debug:
+                    logging.debug("Найдена строка с надписью '%s': %s", actor_field.strip(), event)
+            elif kind == KIND_EXCLUDED:
+                excluded_key = tuple(sorted(actors_list))
+                if excluded_key not in excluded_actor_groups:
+                    excluded_actor_groups[excluded_key] = []
+                    result.actor_index.add_excluded(excluded_key)
+                excluded_actor_groups[excluded_key].append(event)
+                if debug:
+                    logging.debug("Добавлена строка с исключениями %s: %s", actors_list, event)
+            else:
+                result.actor_index.add_multiple(len(result.multiple_actor_lines), actors_list)
+                result.multiple_actor_lines.append((event, actors_list))
+                if debug:
+                    logging.debug("Найдена множественная роль %s: %s", actors_list, event)
+        except Exception as e:
+            logging.error(f"Ошибка при обработке строки: {event}, ошибка: {e}")
+            continue
+
+def split_events(events, rules=None):
+    """Классифицирует события; возвращает Classification или None, если разделять нечего."""
+    logging.info("Начало разделения событий по актерам")
+    result = classify_events(events, rules)
+    if result.is_empty:
+        logging.warning("Не найдено актеров, событий или надписей")
+        show_error("Ошибка", "Не найдено актеров, событий или надписей.")
+        return None
+    logging.info(f"Найдено актеров: {len(result.actors)}, строк 'гуры/все': {len(result.group_lines)}, строк с множественными ролями: {len(result.multiple_actor_lines)}, групп исключений: {len(result.excluded_actor_groups)}, строк с надписями: {len(result.sign_lines)}")
+    suggestions = suggest_aliases({actor: len(lines) for actor, lines in result.actors.items()})
+    if suggestions:
+        logging.warning("Возможные псевдонимы: " + ", ".join(f"'{name}' -> '{canonical}'" for name, canonical, _ in suggestions))
+    return result
+
+def split_by_actor(events):
+    result = split_events(events)
+    if result is None:
+        return None, None, None, None, None, False, False, False, False, None
+    return result.as_tuple()
+
+def format_srt_time(ass_time):
+    """Переводит время .ass в .srt (timecode.ass_to_srt_time); если это не время, как и раньше,
+    возвращает исходную строку с запятой вместо точки."""
+    try:
+        return ass_to_srt_time(ass_time)
+    except ValueError as e:
+        logging.error(f"Ошибка при преобразовании времени {ass_time}: {e}")
+        return ass_time.replace('.', ',')
+
+def save_ass_file(headers, styles, events, output_file, header=None):
+    """Сохраняет .ass; header (AssHeader) передается, чтобы не сериализовать заголовок для каждого файла заново."""
+    logging.info(f"Попытка сохранения .ass файла: {output_file}")
+    try:
+        if header is None:
+            header = AssHeader(headers, styles)
+        with open(output_file, 'wb') as file:
+            file.writelines(iter_ass_blocks(header, events))
+        logging.info(f"Успешно сохранен файл: {output_file}")
+    except Exception as e:
+        logging.error(f"Ошибка при сохранении .ass файла {output_file}: {e}")
+        raise
+
+def save_srt_file(events, output_file):
+    logging.info(f"Попытка сохранения .srt файла: {output_file}")
+    try:
+        content = render_srt(events)
+        with open(output_file, 'wb') as file:
+            file.write(content)
+        logging.info(f"Успешно сохранен файл: {output_file}")
+    except Exception as e:
+        logging.error(f"Ошибка при сохранении .srt файла {output_file}: {e}")
+        raise
+
+def count_output_files(actors, group_lines, multiple_actor_lines, excluded_actor_groups, sign_lines, distribute_group, distribute_multiple, save_signs_ass):
+    """Возвращает число файлов, которые запишет save_actor_files с этими параметрами."""
+    total = len(actors)
+    if not distribute_group and group_lines:
+        total += 1
+    if not distribute_multiple:
+        total += len({combination_key(actors_list) for _, actors_list in multiple_actor_lines}) + len(excluded_actor_groups)
+    if save_signs_ass and sign_lines:
+        total += 1
+    return total
+
+def combination_key(actors_list):
+    """Нормализованный набор актеров строки с множественной ролью: без повторов, по алфавиту."""
+    return tuple(sorted(set(actors_list)))
+
+def group_multiple_lines(multiple_actor_lines):
+    """Группирует строки с множественными ролями по combination_key (как excluded_actor_groups)."""
+    groups = {}
+    for event, actors_list in multiple_actor_lines:
+        key = combination_key(actors_list)
+        if key not in groups:
+            groups[key] = []
+        groups[key].append(event)
+    return groups
+
+def safe_file_name(name):
+    """Удаляет символы, недопустимые в именах файлов."""
+    return re.sub(r'[<>:"/\\|?*]', '', name).strip()
+
+class OutputFile:
+    """Один выходной файл: вид (actor, group, multiple, excluded, signs), подпись для лога, имя файла, формат и события."""
+    __slots__ = ('kind', 'label', 'file_name', 'export_format', 'events')
+
+    def __init__(self, kind, label, file_name, export_format, events):
+        self.kind = kind
+        self.label = label
+        self.file_name = file_name
+        self.export_format = export_format
+        self.events = events
+
+# Ключ хронологического порядка: время начала, при равенстве — порядок в исходном файле
+timeline_key = attrgetter('start', 'index')
+
+def merge_timeline(*buckets):
+    """Сливает отсортированные по timeline_key корзины в один хронологический поток (heapq.merge)."""
+    return heapq.merge(*buckets, key=timeline_key)
+
+def plan_output_files(actors, group_lines, multiple_actor_lines, excluded_actor_groups, sign_lines, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass, actor_index=None, chronological=True):
+    """Составляет список выходных файлов, не трогая диск.
+
+    Распределение множественных ролей и исключений идет через ActorIndex, поэтому сложность
+    линейна по размеру результата, а не O(актеры × строки). При chronological=True каждая корзина
+    сортируется один раз, а файл актера собирается k-путевым слиянием корзин по времени начала,
+    так что .srt не нужно пересортировывать в REAPER. Надписи остаются в исходном порядке:
+    в .ass он определяет порядок отрисовки.
+    """
+    if distribute_multiple and actor_index is None and (multiple_actor_lines or excluded_actor_groups):
+        actor_index = ActorIndex.build(multiple_actor_lines, excluded_actor_groups)
+    if chronological:
+        group_lines = sorted(group_lines, key=timeline_key)
+        excluded_actor_groups = {excluded_key: sorted(events, key=timeline_key) for excluded_key, events in excluded_actor_groups.items()}
+    outputs = []
+
+    for actor, own_events in actors.items():
+        buckets = [sorted(own_events, key=timeline_key) if chronological else own_events]
+        if distribute_group and group_lines:
+            buckets.append(group_lines)
+            logging.debug("Добавлены строки 'гуры/все' для актера %s: %d строк", actor, len(group_lines))
+        if distribute_multiple and multiple_actor_lines:
+            multiple = actor_index.multiple_lines_for(actor, multiple_actor_lines)
+            if chronological:
+                multiple.sort(key=timeline_key)
+            buckets.append(multiple)
+        if distribute_multiple and excluded_actor_groups:
+            excluding = actor_index.excluded.get(actor, ())
+            buckets.extend(events for excluded_key, events in excluded_actor_groups.items() if excluded_key not in excluding)
+        if chronological:
+            events = list(merge_timeline(*buckets))
+        else:
+            events = [event for bucket in buckets for event in bucket]
+        outputs.append(OutputFile(KIND_ACTOR, actor, f"{original_filename} - {safe_file_name(actor)} - ({len(events)}).{export_format}", export_format, events))
+
+    if not distribute_group and group_lines:
+        outputs.append(OutputFile(KIND_GROUP, "гуры/все", f"{original_filename} - Гуры - ({len(group_lines)}).{export_format}", export_format, group_lines))
+
+    if not distribute_multiple and multiple_actor_lines:
+        # Один файл на сочетание актеров, а не на каждую строку
+        for combination, events in group_multiple_lines(multiple_actor_lines).items():
+            if chronological:
+                events.sort(key=timeline_key)
+            safe_actor_name = " ".join(safe_file_name(actor) for actor in combination)
+            outputs.append(OutputFile(KIND_MULTIPLE, ", ".join(combination), f"{original_filename} - {safe_actor_name} - ({len(events)}).{export_format}", export_format, events))
+        logging.info(f"Строки с множественными ролями: {len(multiple_actor_lines)} строк в {sum(output.kind == KIND_MULTIPLE for output in outputs)} файлах (по одному на сочетание актеров)")
+
+    if not distribute_multiple and excluded_actor_groups:
+        for excluded_actors, events in excluded_actor_groups.items():
+            safe_actor_name = "Без " + " ".join(safe_file_name(actor) for actor in excluded_actors)
+            outputs.append(OutputFile(KIND_EXCLUDED, "без " + ", ".join(excluded_actors), f"{original_filename} - {safe_actor_name} - ({len(events)}).{export_format}", export_format, events))
+
+    if save_signs_ass and sign_lines:
+        outputs.append(OutputFile(KIND_SIGN, "надписи", f"{original_filename} - Надписи - ({len(sign_lines)}).ass", 'ass', sign_lines))
+
+    return outputs
+
+# Число потоков записи по умолчанию: перекрывает задержки открытия/закрытия файлов на сетевых папках
+DEFAULT_IO_WORKERS = 4
+
+def render_output_file(output, header):
+    """Возвращает содержимое выходного файла в байтах."""
+    if output.export_format == 'srt':
+        return render_srt(output.events)
+    return render_ass(header, output.events)
+
+def save_actor_files(headers, styles, actors, group_lines, multiple_actor_lines, excluded_actor_groups, sign_lines, output_dir, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass, all_actors, progress=None, cancel_event=None, actor_index=None, incremental=False, io_workers=DEFAULT_IO_WORKERS, bundle=None, compress=False):
+    """Сохраняет файлы по актерам и возвращает список записанных путей.
+
+    При любой ошибке (нечего сохранять, недопустимый формат или архив, нет доступа к папке, ошибка
+    записи) возвращается None, при отмене — пустой список.
+
+    Файлы пишутся во временную папку (publish.StagedOutput) и переносятся в output_dir только
+    все вместе, когда каждый из них записан и сброшен на диск. При ошибке записи или отмене
+    (cancel_event) output_dir остается прежним. progress(done, total) вызывается после каждого файла.
+    actor_index (ActorIndex из classify_events) избавляет от повторного построения индекса.
+    При incremental=True перезаписываются только файлы, содержимое которых изменилось
+    по сравнению с манифестом эпизода, а устаревшие файлы этого эпизода удаляются.
+    Файлы пишутся в io_workers потоках (run_write_jobs); об ошибках записи сообщается
+    одним сообщением в порядке файлов, а не отдельным окном на каждый файл.
+    bundle='zip' или 'tar' складывает все файлы (с теми же именами) и оглавление index.json
+    в один архив, записываемый последовательно; compress включает сжатие (deflate или gzip).
+    """
+    if not actors and not group_lines and not multiple_actor_lines and not excluded_actor_groups and not sign_lines:
+        logging.error("Нет актеров, событий или надписей для сохранения файлов")
+        show_error("Ошибка", "Не найдено актеров, событий или надписей в файле субтитров.")
+        return None
+
+    if export_format not in ('ass', 'srt'):
+        logging.error(f"Недопустимый формат: {export_format}")
+        show_error("Ошибка", f"Недопустимый формат: {export_format}")
+        return None
+
+    if bundle is not None and bundle not in BUNDLE_FORMATS:
+        logging.error(f"Недопустимый формат архива: {bundle}")
+        show_error("Ошибка", f"Недопустимый формат архива: {bundle}")
+        return None
+
+    from .publish import StagedOutput
+    staging = StagedOutput(output_dir, safe_file_name(original_filename))
+    try:
+        staging.create()
+    except Exception as e:
+        logging.error(f"Ошибка доступа к папке {output_dir}: {e}")
+        show_error("Ошибка", f"Нет прав доступа для записи в папку {output_dir}: {e}")
+        return None
+    started = time.perf_counter()
+    try:
+        written = _save_staged(staging, headers, styles, actors, group_lines, multiple_actor_lines, excluded_actor_groups, sign_lines, output_dir, original_filename, export_format,
+                            distribute_group, distribute_multiple, save_signs_ass, progress, cancel_event, actor_index, incremental, io_workers, bundle, compress)
+    finally:
+        staging.discard()
+    if written is not None:
+        logging.info(f"Итого записано файлов: {len(written)} за {(time.perf_counter() - started) * 1000:.1f} мс")
+    return written
+
+def _save_staged(staging, headers, styles, actors, group_lines, multiple_actor_lines, excluded_actor_groups, sign_lines, output_dir, original_filename, export_format,
+                 distribute_group, distribute_multiple, save_signs_ass, progress, cancel_event, actor_index, incremental, io_workers, bundle=None, compress=False):
+    metrics = active_metrics()
+    with metrics.phase('distribute'):
+        outputs = plan_output_files(actors, group_lines, multiple_actor_lines, excluded_actor_groups, sign_lines, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass, actor_index)
+    by_name = {}
+    for output in outputs:
+        by_name[output.file_name] = output
+    if len(by_name) < len(outputs):
+        # Файлы с одинаковым именем (например, одна и та же пара ролей в нескольких строках) раньше
+        # перезаписывали друг друга по очереди; при параллельной записи оставляем сразу последний
+        logging.warning(f"Совпадающих имен файлов: {len(outputs) - len(by_name)}, сохраняется последний файл с каждым именем")
+        outputs = [output for output in outputs if by_name[output.file_name] is output]
+    header = AssHeader(headers, styles)
+    if bundle is not None:
+        with metrics.phase('write'):
+            return _save_bundle(staging, outputs, header, output_dir, original_filename, bundle, compress, progress, cancel_event)
+    manifest = None
+    keys = None
+    if incremental:
+        from .manifest import OutputManifest, content_hash
+        manifest = OutputManifest(output_dir, original_filename).load()
+        keys = [manifest.unique_key(output) for output in outputs]
+
+    def write_output(position):
+        """Задача для пула: пишет один файл во временную папку; возвращает хеш (или None) и признак записи."""
+        output = outputs[position]
+        content = render_output_file(output, header)
+        digest = None
+        if manifest is not None:
+            digest = content_hash(content)
+            if manifest.is_current(keys[position], output.file_name, digest):
+                logging.debug("Без изменений: %s", output.file_name)
+                return digest, False
+        logging.info("Сохранение файла для '%s': %s (строк: %d)", output.label, os.path.join(output_dir, output.file_name), len(output.events))
+        started = time.perf_counter()
+        write_bytes(staging.staged_path(output.file_name), content, fsync=True)
+        metrics.observe('file_write', time.perf_counter() - started)
+        metrics.count('bytes_written', len(content))
+        return digest, True
+
+    with metrics.phase('write'):
+        return _write_staged(staging, outputs, write_output, output_dir, progress, cancel_event, io_workers, manifest, keys)
+
+def _write_staged(staging, outputs, write_output, output_dir, progress, cancel_event, io_workers, manifest, keys):
+    staged = {}
+    errors = []
+    total = len(outputs)
+    for done, (position, outcome) in enumerate(run_write_jobs(write_output, total, io_workers, cancel_event)):
+        if isinstance(outcome, Exception):
+            output_file = os.path.join(output_dir, outputs[position].file_name)
+            logging.error(f"Ошибка при сохранении файла {output_file}: {outcome}")
+            errors.append((position, output_file, outcome))
+        else:
+            staged[position] = outcome
+        if progress is not None:
+            progress(done + 1, total)
+
+    if cancel_event is not None and cancel_event.is_set():
+        logging.info(f"Сохранение отменено пользователем, папка {output_dir} не изменена")
+        return []
+    if errors:
+        report_write_errors(errors)
+        logging.error(f"Файлы не опубликованы из-за ошибок записи, папка {output_dir} не изменена")
+        return None
+
+    changed = [position for position in sorted(staged) if staged[position][1]]
+    written, errors = staging.publish([outputs[position].file_name for position in changed])
+    active_metrics().count('files_created', len(written))
+    if errors:
+        report_write_errors(errors, published=True)
+        failed = {changed[number] for number, _, _ in errors}
+        changed = [position for position in changed if position not in failed]
+    if manifest is not None:
+        from .manifest import remove_output
+        keep_files = {output.file_name for output in outputs}
+        removed = []
+        for position in changed:
+            previous_file = manifest.record(keys[position], outputs[position].file_name, staged[position][0])
+            # Файл со старым именем (например, с прежним числом строк) тоже устаревший
+            if previous_file is not None and previous_file not in keep_files and remove_output(output_dir, previous_file):
+                removed.append(previous_file)
+        removed.extend(manifest.remove_stale(keep_files=keep_files))
+        manifest.save()
+        logging.info(f"Инкрементальное сохранение: записано {len(written)}, без изменений {total - len(written)}, удалено устаревших {len(removed)}")
+    return written
+
+def _save_bundle(staging, outputs, header, output_dir, original_filename, bundle, compress, progress, cancel_event):
+    from .bundle import bundle_file_name, bundle_index, write_bundle
+    file_name = bundle_file_name(original_filename, bundle, compress)
+    output_file = os.path.join(output_dir, file_name)
+    logging.info(f"Сохранение {len(outputs)} файлов в архив {output_file}")
+    try:
+        with open(staging.staged_path(file_name), 'wb') as file:
+            completed = write_bundle(file, outputs, lambda output: render_output_file(output, header), bundle, compress,
+                                     bundle_index(outputs, original_filename), progress, cancel_event)
+            file.flush()
+            os.fsync(file.fileno())
+            active_metrics().count('bytes_written', file.tell())
+    except Exception as e:
+        logging.error(f"Ошибка при сохранении архива {output_file}: {e}")
+        report_write_errors([(0, output_file, e)])
+        return None
+    if not completed:
+        logging.info(f"Сохранение отменено пользователем, папка {output_dir} не изменена")
+        return []
+    written, errors = staging.publish([file_name])
+    active_metrics().count('files_created', len(written))
+    if errors:
+        report_write_errors(errors, published=True)
+    return written
+
+# Сколько ошибок записи перечислять в одном сообщении пользователю
+MAX_REPORTED_ERRORS = 10
+
+def report_write_errors(errors, published=False):
+    """Показывает одно сообщение обо всех ошибках записи в порядке выходных файлов.
+
+    published=False — ошибки при записи во временную папку (в папку с результатами ничего
+    не перенесено), True — при замене файлов в ней (остальные файлы уже заменены).
+    """
+    errors = sorted(errors, key=lambda error: error[0])
+    lines = [f"{output_file}: {error}" for _, output_file, error in errors[:MAX_REPORTED_ERRORS]]
+    if len(errors) > MAX_REPORTED_ERRORS:
+        lines.append(f"... и еще {len(errors) - MAX_REPORTED_ERRORS}")
+    if published:
+        summary = f"Не удалось заменить файлов: {len(errors)}. Возможно, они открыты в другой программе."
+    else:
+        summary = f"Не удалось сохранить файлов: {len(errors)}. Папка с результатами не изменена."
+    show_error("Ошибка", summary + "\n" + "\n".join(lines))
+
+def run_write_jobs(job, count, io_workers=DEFAULT_IO_WORKERS, cancel_event=None):
+    """Выполняет job(position) для позиций 0..count-1 и отдает (позиция, результат или исключение) по мере готовности.
+
+    При io_workers > 1 задачи идут в ограниченный пул потоков: на сетевых папках основное время
+    уходит на открытие и закрытие файлов, и эти задержки перекрываются. После cancel_event
+    еще не начатые задачи не запускаются.
+    """
+    def run(position):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        return job(position)
+
+    if io_workers <= 1 or count <= 1:
+        for position in range(count):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            try:
+                yield position, job(position)
+            except Exception as e:
+                yield position, e
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=min(io_workers, count), thread_name_prefix='writer') as executor:
+        futures = {executor.submit(run, position): position for position in range(count)}
+        for future in as_completed(futures):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = e
+            if outcome is not None:
+                yield futures[future], outcome
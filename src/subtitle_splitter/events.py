@@ -0,0 +1,84 @@
+import sys
+
+from .timecode import parse_ass_time, format_ass_time
+
+class Event:
+    """Одна строка Dialogue, разобранная один раз.
+
+    Время хранится в целых сантисекундах, стиль и имя интернируются, чтобы тысячи строк разделяли
+    одни и те же объекты str. index — порядковый номер строки в исходном файле. line — строка
+    Dialogue для записи: исходная строка файла или, для событий, собранных из полей (например,
+    со сдвинутым временем), строка, собранная при создании. Остальные поля отдельно не хранятся:
+    text — срез line с позиции text_offset, layer, отступы и эффект разбираются из line при обращении.
+    """
+    __slots__ = ('index', 'start', 'end', 'style', 'name', 'line', 'text_offset')
+
+    def __init__(self, index, layer, start, end, style, name, margin_l, margin_r, margin_v, effect, text, line=None):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.style = style
+        self.name = name
+        if line is None:
+            line = (f"Dialogue: {layer},{format_ass_time(start)},{format_ass_time(end)},{style},{name},"
+                    f"{margin_l},{margin_r},{margin_v},{effect},{text}")
+        self.line = line
+        self.text_offset = len(line) - len(text)
+
+    @property
+    def text(self):
+        return self.line[self.text_offset:]
+
+    def _fields(self):
+        """Поля строки до текста: layer, start, end, style, name, margin_l, margin_r, margin_v, effect."""
+        head = self.line[:self.text_offset - 1]
+        if head.startswith('Dialogue:'):
+            head = head[9:]
+        return head.split(',')
+
+    @property
+    def layer(self):
+        return self._fields()[0].strip()
+
+    @property
+    def margin_l(self):
+        return self._fields()[5]
+
+    @property
+    def margin_r(self):
+        return self._fields()[6]
+
+    @property
+    def margin_v(self):
+        return self._fields()[7]
+
+    @property
+    def effect(self):
+        return self._fields()[8]
+
+    @classmethod
+    def parse(cls, line, index=0):
+        """Разбирает строку 'Dialogue: ...'; возвращает None, если полей меньше десяти или время некорректно."""
+        parts = line.split(',', 9)
+        if len(parts) < 10:
+            return None
+        layer = parts[0]
+        if layer.startswith('Dialogue:'):
+            layer = layer[9:]
+        try:
+            start = parse_ass_time(parts[1])
+            end = parse_ass_time(parts[2])
+        except ValueError:
+            return None
+        intern = sys.intern
+        return cls(index, layer, start, end, intern(parts[3]), intern(parts[4]),
+                   parts[5], parts[6], parts[7], parts[8], parts[9], line)
+
+    def to_ass(self):
+        """Возвращает строку Dialogue для записи в .ass."""
+        return self.line
+
+    __str__ = to_ass
+
+    def __repr__(self):
+        return f"Event({self.index}, {self.to_ass()!r})"
@@ -0,0 +1,884 @@
+"""Графический интерфейс (tkinter). Импортируется только при открытии окна: keyboard и tkinterdnd2
+подключаются еще позже — при установке горячих клавиш и создании главного окна."""
+import os
+import sys
+import subprocess
+import logging
+import json
+import queue
+import threading
+from tkinter import Tk, filedialog, messagebox, Frame, StringVar, IntVar, BooleanVar, Toplevel, Button, Label, Checkbutton, Entry, Text, Menu, PhotoImage, Scrollbar
+from tkinter.ttk import Combobox, Progressbar
+
+from .core import save_actor_files, count_output_files, set_error_handler
+from .config import settings_path
+from .cache import ParsedFileCache
+
+# Высота строк 8 и 9 главного окна (флажки инкрементальной записи и архива), по 25 пикселей
+# на строку, как у флажков опций файла; окно не меняет размер, поэтому она входит во все высоты
+SAVE_OPTIONS_HEIGHT = 2 * 25
+
+# Функция для получения пути к файлам ресурсов
+def resource_path(relative_path):
+    """Возвращает абсолютный путь к ресурсу, учитывая PyInstaller."""
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+class SubtitleSplitterApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Разделение субтитров")
+        self.file_path_var = StringVar(value=os.path.expanduser("~/Desktop"))
+        self.format_var = StringVar(value="ass")
+        self.distribute_group_var = IntVar(value=1)
+        self.distribute_multiple_var = IntVar(value=1)
+        self.save_signs_ass_var = IntVar(value=1)  # Чекбокс для надписей
+        self.incremental_var = IntVar(value=0)  # Перезаписывать только измененные файлы
+        self.bundle_var = IntVar(value=0)  # Сохранять одним .zip архивом
+        self.show_group_option = BooleanVar(value=False)
+        self.show_multiple_option = BooleanVar(value=False)
+        self.show_signs_option = BooleanVar(value=False)  # Флаг для отображения чекбокса надписей
+        self.settings_file = settings_path()
+        # Настройки читаются после показа окна (check_update_info), а не при создании
+        self.show_update_var = BooleanVar(value=True)
+        # Дисковый кеш разобранных файлов (pickle в папке настроек) включается в настройках, по умолчанию выключен
+        self.disk_cache_var = BooleanVar(value=False)
+        self.keyboard = None
+        logging.info(f"Инициализация: settings_file={self.settings_file}")
+
+        self.actors = None
+        self.group_lines = None
+        self.multiple_actor_lines = None
+        self.excluded_actor_lines = None
+        self.sign_lines = None  # Список строк с надписями
+        self.headers = None
+        self.styles = None
+        self.events = None
+        self.all_actors = None
+        self.actor_index = None
+        # Кеш разобранных файлов: повторный выбор того же эпизода не парсит его заново
+        self.parsed_cache = ParsedFileCache(disk=False)
+
+        # Фоновая обработка: рабочий поток пишет сообщения в очередь, главный поток опрашивает ее через root.after
+        self.task_queue = queue.Queue()
+        self.worker = None
+        self.cancel_event = threading.Event()
+
+        # Создание меню
+        self.menu_bar = Menu(self.root)
+        self.root.config(menu=self.menu_bar)
+        self.file_menu = Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Файл", menu=self.file_menu)
+        self.file_menu.add_command(label="Открыть файл", command=self.choose_file)
+        self.file_menu.add_command(label="Очистить поле", command=self.clear_field)
+        self.file_menu.add_command(label="Настройки", command=self.show_settings)
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Выход", command=self.on_closing)
+        self.help_menu = Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Помощь", menu=self.help_menu)
+        self.help_menu.add_command(label="Руководство", command=self.show_help)
+        self.help_menu.add_command(label="О программе", command=self.show_about)
+        self.help_menu.add_command(label="Информация об обновлениях", command=self.show_update_info)
+
+        # Контекстное меню
+        self.context_menu = Menu(self.root, tearoff=0)
+        self.context_menu.add_command(label="Копировать", command=self.copy_text)
+        self.context_menu.add_command(label="Вставить", command=self.paste_text)
+        self.context_menu.add_command(label="Выделить все", command=self.select_all_text)
+
+        self.setup_hotkeys()
+
+        # Настройка окна
+        window_width = 450
+        window_height = 300 + SAVE_OPTIONS_HEIGHT
+        screen_width = root.winfo_screenwidth()
+        screen_height = root.winfo_screenheight()
+        x = (screen_width - window_width) // 2
+        y = (screen_height - window_height) // 2
+        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        self.root.resizable(False, False)
+        self.root.configure(bg="#eceff1")
+
+        try:
+            self.root.iconbitmap(resource_path("favicon.ico"))
+        except Exception as e:
+            logging.warning(f"Не удалось установить иконку favicon.ico: {e}")
+
+        # Основной фрейм
+        self.main_frame = Frame(root, bg="#ffffff", bd=2, relief="flat", highlightbackground="#b0bec5", highlightcolor="#b0bec5", highlightthickness=2)
+        self.main_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.main_frame.grid_columnconfigure(1, weight=0)
+
+        Label(self.main_frame, text="Разделение субтитров по актерам", font=("Arial", 12, "bold"), bg="#ffffff", fg="black").grid(row=0, column=0, columnspan=2, pady=10)
+        Label(self.main_frame, text="Путь к .ass файлу:", font=("Arial", 10), bg="#ffffff", fg="black").grid(row=1, column=0, sticky="w", padx=10)
+        self.file_entry = Entry(self.main_frame, textvariable=self.file_path_var, font=("Arial", 9), bg="#f5f5f5", fg="black", relief="sunken", borderwidth=1)
+        self.file_entry.grid(row=2, column=0, sticky="we", padx=(10, 5), pady=5)
+        self.file_entry.bind("<Button-3>", self.show_context_menu)
+        self.file_entry.bind("<Control-c>", self.copy_text)
+        self.file_entry.bind("<Control-v>", self.paste_text)
+        self.file_entry.bind("<Control-a>", self.select_all_text)
+        self.setup_drag_and_drop()
+        Button(self.main_frame, text="Выбрать", font=("Arial", 9), bg="#4CAF50", fg="white", activebackground="#45a049", activeforeground="white", relief="raised", borderwidth=2, command=self.choose_file).grid(row=2, column=1, sticky="w", padx=(5, 10), pady=5)
+        self.group_check = Checkbutton(self.main_frame, text="Распределять строки 'гуры/все'", variable=self.distribute_group_var, font=("Arial", 9), bg="#ffffff", fg="black")
+        self.group_check.grid_forget()
+        self.multiple_check = Checkbutton(self.main_frame, text="Распределять множественные роли", variable=self.distribute_multiple_var, font=("Arial", 9), bg="#ffffff", fg="black")
+        self.multiple_check.grid_forget()
+        self.signs_check = Checkbutton(self.main_frame, text="Сохранять надписи в .ass", variable=self.save_signs_ass_var, font=("Arial", 9), bg="#ffffff", fg="black")
+        self.signs_check.grid_forget()
+        Label(self.main_frame, text="Формат сохранения:", font=("Arial", 10), bg="#ffffff", fg="black").grid(row=6, column=0, sticky="w", padx=10, pady=5)
+        format_menu = Combobox(self.main_frame, textvariable=self.format_var, values=["ass", "srt"], width=20, font=("Arial", 9), state="readonly")
+        format_menu.grid(row=7, column=0, sticky="w", padx=10, pady=5)
+        Checkbutton(self.main_frame, text="Перезаписывать только измененные файлы", variable=self.incremental_var, font=("Arial", 9), bg="#ffffff", fg="black").grid(row=8, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+        Checkbutton(self.main_frame, text="Сохранять одним .zip архивом", variable=self.bundle_var, font=("Arial", 9), bg="#ffffff", fg="black").grid(row=9, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+
+        # Фрейм для кнопок
+        button_frame = Frame(self.root, bg="#eceff1")
+        button_frame.pack(side="bottom", fill="x", pady=5)
+        close_button = Button(button_frame, text="Закрыть", font=("Arial", 10, "bold"), bg="#d32f2f", fg="white", activebackground="#c62828", activeforeground="white", relief="raised", borderwidth=2, command=self.close_app)
+        close_button.pack(side="right", padx=5, ipadx=10)
+        self.start_button = Button(button_frame, text="Запустить", font=("Arial", 10, "bold"), bg="#0288d1", fg="white", activebackground="#0277bd", activeforeground="white", relief="raised", borderwidth=2, command=self.start_processing)
+        self.start_button.pack(side="right", padx=5, ipadx=10)
+        self.cancel_button = Button(button_frame, text="Отмена", font=("Arial", 10, "bold"), bg="#9e9e9e", fg="white", activebackground="#757575", activeforeground="white", relief="raised", borderwidth=2, state="disabled", command=self.cancel_processing)
+        self.cancel_button.pack(side="right", padx=5, ipadx=10)
+        self.progress_bar = Progressbar(button_frame, orient="horizontal", mode="determinate", length=110)
+        self.progress_bar.pack(side="left", padx=5)
+        self.progress_label = Label(button_frame, text="", font=("Arial", 9), bg="#eceff1", fg="black")
+        self.progress_label.pack(side="left")
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        self.root.after(100, self.check_update_info)
+
+    def setup_hotkeys(self):
+        """Устанавливает горячие клавиши через keyboard, а без него — через bind окна.
+
+        keyboard импортируется здесь: на Linux импорт сразу запускает глобальный перехватчик клавиш.
+        """
+        try:
+            import keyboard
+            keyboard.add_hotkey('ctrl+c', self.copy_text)
+            keyboard.add_hotkey('ctrl+v', self.paste_text)
+            keyboard.add_hotkey('ctrl+a', self.select_all_text)
+            keyboard.add_hotkey('ctrl+с', self.copy_text)
+            keyboard.add_hotkey('ctrl+в', self.paste_text)
+            keyboard.add_hotkey('ctrl+ф', self.select_all_text)
+            logging.info("Горячие клавиши через keyboard установлены")
+        except Exception as e:
+            logging.error(f"Ошибка установки горячих клавиш через keyboard: {e}")
+            self.root.bind("<Control-c>", self.copy_text)
+            self.root.bind("<Control-v>", self.paste_text)
+            self.root.bind("<Control-a>", self.select_all_text)
+        else:
+            self.keyboard = keyboard
+
+    def check_update_info(self):
+        """Читает настройки и открывает окно 'Информация об обновлениях', если оно не отключено."""
+        self.show_update_var.set(self.load_settings())
+        if self.show_update_var.get():
+            logging.info("Открытие окна 'Информация об обновлениях' по настройкам")
+            self.show_update_info()
+        else:
+            logging.info("Окно 'Информация об обновлениях' не будет показано")
+
+    def setup_drag_and_drop(self):
+        """Настраивает поддержку drag-and-drop для Entry."""
+        try:
+            from tkinterdnd2 import DND_FILES
+        except ImportError:
+            logging.warning("Drag-and-drop не поддерживается: tkinterdnd2 не установлена")
+            messagebox.showwarning("Предупреждение", "Функция drag-and-drop недоступна. Установите библиотеку tkinterdnd2.")
+            return
+        try:
+            self.file_entry.drop_target_register(DND_FILES)
+            self.file_entry.dnd_bind('<<Drop>>', self.handle_drop)
+            logging.info("Drag-and-drop настроен для поля ввода")
+        except Exception as e:
+            logging.error(f"Ошибка настройки drag-and-drop: {e}")
+            messagebox.showerror("Ошибка", f"Не удалось настроить drag-and-drop: {e}")
+
+    def handle_drop(self, event):
+        """Обрабатывает событие drop для перетаскивания файла."""
+        try:
+            file_path = event.data
+            if file_path.startswith('{') and file_path.endswith('}'):
+                file_path = file_path[1:-1]
+            file_path = file_path.strip()
+            if not file_path:
+                logging.error("Путь к файлу пустой")
+                messagebox.showerror("Ошибка", "Перетаскиваемый файл не распознан.")
+                return
+            if not file_path.lower().endswith('.ass'):
+                logging.error(f"Недопустимое расширение файла: {file_path}")
+                messagebox.showerror("Ошибка", "Файл должен иметь расширение .ass.")
+                return
+            if not os.path.isfile(file_path):
+                logging.error(f"Файл не существует: {file_path}")
+                messagebox.showerror("Ошибка", "Указанный файл не существует.")
+                return
+            if self.is_busy():
+                return
+            self.file_path_var.set(file_path)
+            logging.info(f"Файл перетащен: {file_path}")
+            self.load_file(file_path)
+        except Exception as e:
+            logging.error(f"Ошибка при обработке перетаскивания файла: {e}")
+            messagebox.showerror("Ошибка", f"Не удалось обработать перетаскиваемый файл: {e}")
+
+    def load_settings(self):
+        """Загружает настройки из settings.json."""
+        try:
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+                show_update = settings.get('show_update', True)
+                self.disk_cache_var.set(bool(settings.get('disk_cache', False)))
+                self.parsed_cache.disk = self.disk_cache_var.get()
+                logging.info(f"Настройки загружены: show_update={show_update}, disk_cache={self.parsed_cache.disk}")
+                return show_update
+        except FileNotFoundError:
+            logging.info("Файл настроек не найден, используется show_update=True")
+            return True
+        except json.JSONDecodeError:
+            logging.error("Ошибка декодирования JSON, используется show_update=True")
+            return True
+        except Exception as e:
+            logging.error(f"Ошибка загрузки настроек: {e}")
+            return True
+
+    def save_settings(self):
+        """Сохраняет настройки в settings.json, не затирая остальные ключи (например, name_rules)."""
+        try:
+            try:
+                with open(self.settings_file, 'r', encoding='utf-8') as f:
+                    settings = json.load(f)
+                if not isinstance(settings, dict):
+                    settings = {}
+            except (FileNotFoundError, json.JSONDecodeError):
+                settings = {}
+            settings['show_update'] = self.show_update_var.get()
+            settings['disk_cache'] = self.disk_cache_var.get()
+            with open(self.settings_file, 'w', encoding='utf-8') as f:
+                json.dump(settings, f, ensure_ascii=False, indent=4)
+            logging.info(f"Настройки сохранены: {settings}")
+        except PermissionError:
+            logging.error(f"Ошибка: Нет прав для записи в {self.settings_file}")
+            messagebox.showerror("Ошибка", f"Не удалось сохранить настройки: нет прав для записи.")
+        except Exception as e:
+            logging.error(f"Ошибка сохранения настроек: {e}")
+            messagebox.showerror("Ошибка", f"Не удалось сохранить настройки: {e}")
+
+    def show_update_info(self):
+        logging.info("Открытие окна 'Информация об обновлениях'")
+        update_window = Toplevel(self.root)
+        update_window.title("Информация об обновлениях")
+        update_window.geometry("450x350")
+        update_window.configure(bg="#eceff1")
+        update_window.transient(self.root)
+        update_window.grab_set()
+
+        try:
+            update_window.iconbitmap(resource_path("favicon.ico"))
+        except Exception as e:
+            logging.warning(f"Не удалось установить иконку: {e}")
+
+        update_frame = Frame(update_window, bg="#ffffff", bd=2, relief="flat", highlightbackground="#b0bec5", highlightcolor="#b0bec5", highlightthickness=2)
+        update_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        text_frame = Frame(update_frame, bg="#ffffff")
+        text_frame.pack(fill="both", expand=True, padx=5, pady=5)
+
+        update_text = Text(text_frame, height=15, width=50, wrap="word", font=("Arial", 9), bg="#f5f5f5", fg="black", relief="sunken", borderwidth=1)
+        scrollbar = Scrollbar(text_frame, orient="vertical", command=update_text.yview)
+        update_text.configure(yscrollcommand=scrollbar.set)
+
+        update_text.tag_configure("bold", font=("Arial", 9, "bold"))
+        update_text.tag_configure("header", font=("Arial", 12, "bold"))
+
+        update_content = """Информация об обновлениях версии 1.1.0
+
+    Изменения по сравнению с версией 1.0.2:
+
+    Новые функции
+    - Добавлен: полноценный графический интерфейс (GUI) с полем ввода, выбором формата и чекбоксами
+    - Реализовано: контекстное меню и горячие клавиши (Ctrl+C, Ctrl+V, Ctrl+A)
+    - Добавлено: меню приложения с разделами "Файл" и "Помощь"
+    - Улучшена: обработка сложных случаев: строк "гуры/все", множественных ролей и исключений
+    - Добавлены: информационные окна: "О программе", "Руководство", "Сохранение завершено"
+    - Реализована: система настроек с возможностью отключения уведомлений об обновлениях
+    - Добавлено: окно "Информация об обновлениях"
+    - Добавлена: поддержка перетаскивания .ass файлов в поле ввода
+    - Реализовано: автоматическая проверка расширения перетаскиваемых файлов
+    - Добавлен: чекбокс "Сохранять надписи в .ass" для сохранения строк с метками "НАДПИСЬ", "Надпись", "надпись", "НАДПИСИ", "Надписи", "надписи", "SIGNS", "Signs", "signs", "SIGN", "Sign", "sign", "TEXT", "Text", "text", "ТЕКСТ", "Текст", "текст" в .ass файл
+    - Реализовано: автоматическое определение строк с надписями при парсинге файла
+    - Добавлено: сохранение надписей в отдельный .ass файл при выборе формата .srt
+
+    Улучшения
+    - Значительно улучшено: логирование и обработка ошибок
+    - Все окна: теперь автоматически центрируются на экране
+    - Реализована: безопасная обработка имен файлов с недопустимыми символами
+    - Добавлено: динамическое изменение размера основного окна в зависимости от контента
+    - Улучшена: работа с путями к файлам для кросс-платформенной совместимости
+    - Добавлена: поддержка упаковки в exe с правильной обработкой ресурсов
+    - Улучшена: обработка путей файлов при перетаскивании
+    - Добавлена: поддержка кроссплатформенного drag-and-drop
+    - Улучшена: обработка строк с надписями для совместимости с вшиванием в видео
+    - Добавлено: динамическое отображение чекбокса для надписей
+
+    Исправления
+    - Исправлена: обработка пустых имен актеров
+    - Улучшена: работа с Unicode для русских символов
+    - Исправлены: различные мелкие баги в обработке субтитров
+    - Улучшена: совместимость с разными форматами ASS файлов
+    - Исправлена: обработка некорректных путей при перетаскивании
+    - Улучшена: совместимость с различными форматами путей файлов
+    - Исправлена: обработка некорректных меток надписей
+
+    Поддержка
+    Обратитесь к автору: https://t.me/itsptashka"""
+
+        update_text.insert("end", update_content)
+        logging.info("Текст обновлений успешно вставлен в виджет")
+        update_text.tag_add("header", "1.0", "1.end")
+        for section in ["Новые функции", "Улучшения", "Исправления", "Поддержка"]:
+            start = update_text.search(section, "1.0", stopindex="end")
+            if start:
+                end = f"{start}+{len(section)}c"
+                update_text.tag_add("bold", start, end)
+                logging.debug(f"Применен жирный шрифт для раздела: {section}")
+        for line in update_content.split('\n'):
+            if line.startswith('- ') and ':' in line:
+                start = update_text.search(line, "1.0", stopindex="end")
+                if start:
+                    colon_pos = update_text.search(":", start, stopindex=f"{start}+{len(line)}c")
+                    if colon_pos:
+                        end = f"{colon_pos}+1c"
+                        update_text.tag_add("bold", start, end)
+                        logging.debug(f"Применен жирный шрифт для строки: {line[:line.index(':')+1]}")
+
+        update_text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        update_text.configure(state="disabled")
+        logging.info("Виджет Text и Scrollbar добавлены в окно")
+
+        button_frame = Frame(update_frame, bg="#ffffff")
+        button_frame.pack(fill="x", pady=5, side="bottom")
+
+        dont_show_var = BooleanVar(value=not self.show_update_var.get())
+        def save_and_close():
+            self.show_update_var.set(not dont_show_var.get())
+            self.save_settings()
+            update_window.destroy()
+            logging.info("Окно обновлений закрыто, настройки сохранены")
+
+        Checkbutton(button_frame, text="Больше не показывать", variable=dont_show_var, font=("Arial", 9), bg="#ffffff", fg="black").pack(side="left", padx=5)
+        close_button = Button(button_frame, text="Закрыть", font=("Arial", 9), bg="#d32f2f", fg="white", activebackground="#c62828", activeforeground="white", relief="raised", borderwidth=2, command=save_and_close)
+        close_button.pack(side="right", padx=5, ipadx=10)
+
+        update_window.update_idletasks()
+        width = update_window.winfo_reqwidth()
+        height = update_window.winfo_reqheight()
+        x = (update_window.winfo_screenwidth() // 2) - (width // 2)
+        y = (update_window.winfo_screenheight() // 2) - (height // 2)
+        update_window.geometry(f"{width}x{height}+{x}+{y}")
+        update_window.lift()
+        logging.info(f"Окно 'Информация об обновлениях' центрировано: {width}x{height}+{x}+{y}")
+
+    def toggle_disk_cache(self):
+        """Включает или выключает дисковый кеш разобранных файлов и сохраняет настройку."""
+        self.parsed_cache.disk = self.disk_cache_var.get()
+        logging.info(f"Дисковый кеш разобранных файлов: {'включен' if self.parsed_cache.disk else 'выключен'}")
+        self.save_settings()
+
+    def show_settings(self):
+        logging.info("Открытие окна 'Настройки'")
+        settings_window = Toplevel(self.root)
+        settings_window.title("Настройки")
+        settings_window.geometry("350x150")
+        settings_window.configure(bg="#eceff1")
+        settings_window.transient(self.root)
+        settings_window.grab_set()
+
+        try:
+            settings_window.iconbitmap(resource_path("favicon.ico"))
+        except Exception as e:
+            logging.warning(f"Не удалось установить иконку: {e}")
+
+        settings_frame = Frame(settings_window, bg="#ffffff", bd=2, relief="flat", highlightbackground="#b0bec5", highlightcolor="#b0bec5", highlightthickness=2)
+        settings_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        Label(settings_frame, text="Настройки программы", font=("Arial", 12, "bold"), bg="#ffffff", fg="black").pack(pady=5)
+        Checkbutton(settings_frame, text="Показывать информацию об обновлениях при запуске", variable=self.show_update_var, font=("Arial", 9), bg="#ffffff", fg="black", command=lambda: [self.show_update_var.set(not self.show_update_var.get()), self.save_settings()]).pack(anchor="w", padx=10, pady=5)
+        Checkbutton(settings_frame, text="Кешировать разобранные файлы на диске", variable=self.disk_cache_var, font=("Arial", 9), bg="#ffffff", fg="black", command=self.toggle_disk_cache).pack(anchor="w", padx=10, pady=5)
+
+        button_frame = Frame(settings_frame, bg="#ffffff")
+        button_frame.pack(fill="x", pady=5, side="bottom")
+        close_button = Button(button_frame, text="Закрыть", font=("Arial", 9), bg="#d32f2f", fg="white", activebackground="#c62828", activeforeground="white", relief="raised", borderwidth=2, command=settings_window.destroy)
+        close_button.pack(side="right", padx=5, ipadx=10)
+
+        settings_window.update_idletasks()
+        width = settings_window.winfo_reqwidth()
+        height = settings_window.winfo_reqheight()
+        x = (settings_window.winfo_screenwidth() // 2) - (width // 2)
+        y = (settings_window.winfo_screenheight() // 2) - (height // 2)
+        settings_window.geometry(f"{width}x{height}+{x}+{y}")
+        settings_window.lift()
+        logging.info(f"Окно 'Настройки' центрировано: {width}x{height}+{x}+{y}")
+
+    def show_context_menu(self, event):
+        self.context_menu.post(event.x_root, event.y_root)
+        logging.info("Контекстное меню отображено")
+
+    def copy_text(self, event=None):
+        try:
+            focused_widget = self.root.focus_get()
+            if isinstance(focused_widget, Entry):
+                text = focused_widget.selection_get() if focused_widget.selection_present() else focused_widget.get()
+                if text:
+                    self.root.clipboard_clear()
+                    self.root.clipboard_append(text)
+                    logging.info(f"Текст скопирован (Entry): {text}")
+            elif isinstance(focused_widget, Text):
+                if focused_widget.tag_ranges("sel"):
+                    text = focused_widget.get("sel.first", "sel.last")
+                else:
+                    text = focused_widget.get("1.0", "end-1c")
+                if text:
+                    self.root.clipboard_clear()
+                    self.root.clipboard_append(text)
+                    logging.info(f"Текст скопирован (Text): {text}")
+        except Exception as e:
+            logging.error(f"Ошибка копирования: {e}")
+
+    def paste_text(self, event=None):
+        try:
+            focused_widget = self.root.focus_get()
+            if isinstance(focused_widget, Entry):
+                cursor_pos = focused_widget.index("insert")
+                text = self.root.clipboard_get()
+                focused_widget.insert(cursor_pos, text)
+                logging.info(f"Текст вставлен (Entry): {text}")
+            elif isinstance(focused_widget, Text):
+                cursor_pos = focused_widget.index("insert")
+                text = self.root.clipboard_get()
+                focused_widget.insert(cursor_pos, text)
+                logging.info(f"Текст вставлен (Text): {text}")
+        except Exception as e:
+            logging.error(f"Ошибка вставки: {e}")
+
+    def select_all_text(self, event=None):
+        try:
+            focused_widget = self.root.focus_get()
+            if isinstance(focused_widget, Entry):
+                focused_widget.select_range(0, "end")
+                focused_widget.icursor("end")
+                logging.info("Текст выделен (Entry)")
+            elif isinstance(focused_widget, Text):
+                focused_widget.tag_add("sel", "1.0", "end-1c")
+                focused_widget.mark_set("insert", "end")
+                logging.info("Текст выделен (Text)")
+        except Exception as e:
+            logging.error(f"Ошибка выделения текста: {e}")
+
+    def show_help(self):
+        logging.info("Открытие окна 'Руководство'")
+        help_window = Toplevel(self.root)
+        help_window.title("Руководство")
+        help_window.geometry("450x350")
+        help_window.configure(bg="#eceff1")
+        help_window.transient(self.root)
+        help_window.grab_set()
+
+        try:
+            help_window.iconbitmap(resource_path("favicon.ico"))
+        except Exception as e:
+            logging.warning(f"Не удалось установить иконку: {e}")
+
+        help_frame = Frame(help_window, bg="#ffffff", bd=2, relief="flat", highlightbackground="#b0bec5", highlightcolor="#b0bec5", highlightthickness=2)
+        help_frame.pack(padx=10, pady=10, fill="both", expand=True)
+
+        text_frame = Frame(help_frame, bg="#ffffff")
+        text_frame.pack(fill="both", expand=True, padx=5, pady=5)
+
+        help_text = Text(text_frame, height=15, width=50, wrap="word", font=("Arial", 9), bg="#f5f5f5", fg="black", relief="sunken", borderwidth=1)
+        scrollbar = Scrollbar(text_frame, orient="vertical", command=help_text.yview)
+        help_text.configure(yscrollcommand=scrollbar.set)
+
+        help_text.tag_configure("bold", font=("Arial", 9, "bold"))
+        help_text.tag_configure("header", font=("Arial", 12, "bold"))
+
+        help_content = """Руководство по программе
+
+    Назначение программы
+    Программа Разделение субтитров предназначена для автоматического разделения субтитров в формате .ass на отдельные файлы для каждого актера. Поддерживаются форматы сохранения .ass и .srt.
+
+    Подготовка файла субтитров
+    Файл .ass должен содержать секцию [Events] с диалогами в формате:
+    Dialogue: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+
+    Где поле Name содержит имена актеров или метки. Поддерживаются следующие форматы:
+    1. Один актер:          Name: Актер 1
+    2. Несколько актеров:   Name: Актер 1, Актер 2  или  Name: Актер 1; Актер 2
+    3. Исключения:          Name: !Актер 1, Актер 2 (диалог для всех КРОМЕ указанных актеров)
+    4. Групповые диалоги:   Name: гуры  или  Name: все.
+    5. Надписи:             Name: НАДПИСЬ, Надпись, надпись, НАДПИСИ, Надписи, надписи, SIGNS, Signs, signs, SIGN, Sign, sign, TEXT, Text, text, ТЕКСТ, Текст, "текст"
+
+    Специальные символы:
+    - Запятая или точка с запятой - разделители для нескольких актеров
+    - Восклицательный знак в начале - индикатор исключения
+
+    Как использовать
+    1. Перетащите .ass файл в поле ввода или нажмите кнопку "Выбрать" либо используйте меню "Файл → Открыть файл"
+    2. Настройте параметры:
+       - "Распределять строки 'гуры/все'" - включает общие строки в файлы всех актеров
+       - "Распределять множественные роли" - добавляет строки с несколькими актерами/исключениями
+       - "Сохранять надписи в .ass" - сохраняет строки с метками надписей в .ass файл (даже при выборе .srt)
+    3. Выберите формат сохранения: .ass или .srt
+    4. Нажмите "Запустить" для обработки файла
+
+    Результат
+    - Файлы сохраняются в папку "Subtitles_by_Actor" рядом с исходным файлом
+    - Имена файлов: "<Исходное_имя> - <Имя_актера> - (<Количество_строк>).ass/srt"
+    - При выборе .srt и включенном "Сохранять надписи в .ass" создается дополнительный файл "<Исходное_имя> - Надписи.ass"
+    - В .srt добавляется защитный субтитр для совместимости с REAPER
+
+    Примеры обработки:
+    1. "Актер 1, Актер 2" - строка попадет в файлы обоих актеров
+    2. "!Актер 1" - строка попадет во все файлы, КРОМЕ файла Актер 1
+    3. "гуры" или "все" - строка попадет во все файлы (если включена опция)
+    4. "Надпись" - строка попадет в отдельный .ass файл (если включена опция)
+
+    Преимущества
+    - Экономия времени: автоматизация рутинной работы
+    - Гибкость: поддержка сложных случаев с несколькими актерами и надписями
+    - Простота: интуитивный интерфейс, горячие клавиши и перетаскивание файлов
+    - Надежность: подробное логирование и обработка ошибок
+
+    Поддержка
+    При возникновении вопросов обратитесь к автору программы: https://t.me/itsptashka
+
+    Разделение субтитров — ваш удобный инструмент для работы с субтитрами!"""
+
+        help_text.insert("end", help_content)
+        logging.info("Текст руководства успешно вставлен в виджет")
+        help_text.tag_add("header", "1.0", "1.end")
+        for section in ["Назначение программы", "Как использовать", "Результат", "Преимущества", "Поддержка"]:
+            start = help_text.search(section, "1.0", stopindex="end")
+            if start:
+                end = f"{start}+{len(section)}c"
+                help_text.tag_add("bold", start, end)
+                logging.debug(f"Применен жирный шрифт для раздела: {section}")
+
+        help_text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        help_text.configure(state="disabled")
+        logging.info("Виджет Text и Scrollbar добавлены в окно руководства")
+
+        button_frame = Frame(help_frame, bg="#ffffff")
+        button_frame.pack(fill="x", pady=5, side="bottom")
+        close_button = Button(button_frame, text="Закрыть", font=("Arial", 9), bg="#d32f2f", fg="white", activebackground="#c62828", activeforeground="white", relief="raised", borderwidth=2, command=help_window.destroy)
+        close_button.pack(side="right", padx=5, ipadx=10)
+
+        help_window.update_idletasks()
+        width = help_window.winfo_reqwidth()
+        height = help_window.winfo_reqheight()
+        x = (help_window.winfo_screenwidth() // 2) - (width // 2)
+        y = (help_window.winfo_screenheight() // 2) - (height // 2)
+        help_window.geometry(f"{width}x{height}+{x}+{y}")
+        help_window.lift()
+        logging.info(f"Окно 'Руководство' центрировано: {width}x{height}+{x}+{y}")
+
+    def show_about(self):
+        logging.info("Открытие окна 'О программе'")
+        about_window = Toplevel(self.root)
+        about_window.title("О программе")
+        about_window.geometry("350x200")
+        about_window.configure(bg="#eceff1")
+        about_window.transient(self.root)
+        about_window.grab_set()
+
+        try:
+            about_window.iconbitmap(resource_path("favicon.ico"))
+        except Exception as e:
+            logging.warning(f"Не удалось установить иконку: {e}")
+
+        about_frame = Frame(about_window, bg="#ffffff", bd=2, relief="flat", highlightbackground="#b0bec5", highlightcolor="#b0bec5", highlightthickness=2)
+        about_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        try:
+            favicon = PhotoImage(file=resource_path("favicon.png"))
+            Label(about_frame, image=favicon, bg="#ffffff").pack(anchor="nw", padx=5, pady=5)
+            about_frame.image = favicon
+        except Exception as e:
+            logging.warning(f"Не удалось загрузить favicon.png: {e}")
+        Label(about_frame, text="Распределитель субтитров", font=("Arial", 10, "bold"), bg="#ffffff", fg="black").pack(anchor="w", padx=5)
+        Label(about_frame, text="Версия: 1.1.0", font=("Arial", 9), bg="#ffffff", fg="black").pack(anchor="w", padx=5)
+        Label(about_frame, text="Издатель: Объект всеобщей ненависти", font=("Arial", 9), bg="#ffffff", fg="black").pack(anchor="w", padx=5)
+        Label(about_frame, text="Разработчик: Феофилакт Птахен", font=("Arial", 9), bg="#ffffff", fg="black").pack(anchor="w", padx=5)
+        Label(about_frame, text="Описание: Разделение субтитров по актерам", font=("Arial", 9), bg="#ffffff", fg="black").pack(anchor="w", padx=5)
+        Label(about_frame, text="© Объект всеобщей ненависти. Все права не защищены.", font=("Arial", 9), bg="#ffffff", fg="black", wraplength=320, justify="left").pack(anchor="w", padx=5)
+        button_frame = Frame(about_frame, bg="#ffffff")
+        button_frame.pack(fill="x", pady=5, side="bottom")
+        close_button = Button(button_frame, text="Закрыть", font=("Arial", 9), bg="#d32f2f", fg="white", activebackground="#c62828", activeforeground="white", relief="raised", borderwidth=2, command=about_window.destroy)
+        close_button.pack(side="right", padx=5, ipadx=10)
+
+        about_window.update_idletasks()
+        width = about_window.winfo_reqwidth()
+        height = about_window.winfo_reqheight()
+        x = (about_window.winfo_screenwidth() // 2) - (width // 2)
+        y = (about_window.winfo_screenheight() // 2) - (height // 2)
+        about_window.geometry(f"{width}x{height}+{x}+{y}")
+        about_window.lift()
+        logging.info(f"Окно 'О программе' центрировано: {width}x{height}+{x}+{y}")
+
+    def clear_field(self):
+        self.file_path_var.set(os.path.expanduser("~/Desktop"))
+        self.show_group_option.set(False)
+        self.show_multiple_option.set(False)
+        self.show_signs_option.set(False)
+        self.group_check.grid_forget()
+        self.multiple_check.grid_forget()
+        self.signs_check.grid_forget()
+        self.actors = None
+        self.group_lines = None
+        self.multiple_actor_lines = None
+        self.excluded_actor_lines = None
+        self.sign_lines = None
+        self.all_actors = None
+        self.actor_index = None
+        self.root.geometry(f"450x{300 + SAVE_OPTIONS_HEIGHT}")
+        logging.info("Поле ввода и чекбоксы очищены")
+
+    def on_closing(self):
+        try:
+            self.cancel_event.set()
+            if self.keyboard is not None:
+                self.keyboard.unhook_all()
+            self.root.destroy()
+            logging.info("Программа закрыта")
+            sys.exit(0)
+        except Exception as e:
+            logging.error(f"Ошибка при закрытии программы: {e}")
+            sys.exit(1)
+
+    def close_app(self):
+        logging.info("Пользователь закрыл программу")
+        self.on_closing()
+
+    def choose_file(self):
+        if self.is_busy():
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("ASS files", "*.ass"), ("All files", "*.*")], initialdir=os.path.expanduser("~/Desktop"))
+        if file_path:
+            self.file_path_var.set(file_path)
+            self.load_file(file_path)
+        else:
+            self.clear_field()
+
+    def is_busy(self):
+        """Проверяет, выполняется ли сейчас фоновая обработка."""
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showwarning("Предупреждение", "Дождитесь окончания текущей обработки или нажмите \"Отмена\".")
+            return True
+        return False
+
+    def report_error(self, title, message):
+        """Показывает ошибку ядра: из рабочего потока сообщение передается в главный через очередь."""
+        if threading.current_thread() is threading.main_thread():
+            messagebox.showerror(title, message)
+        else:
+            self.task_queue.put(('error', title, message))
+
+    def run_in_background(self, work, on_done, status):
+        """Запускает work() в рабочем потоке; on_done(result) вызывается в главном потоке Tk."""
+        self.cancel_event.clear()
+        self.start_button.config(state="disabled")
+        self.progress_bar.config(mode="indeterminate", value=0)
+        self.progress_bar.start(10)
+        self.progress_label.config(text=status)
+
+        def target():
+            try:
+                self.task_queue.put(('done', on_done, work()))
+            except Exception as e:
+                logging.error(f"Ошибка в фоновой обработке: {e}")
+                self.task_queue.put(('error', "Ошибка", f"Произошла ошибка: {e}"))
+                self.task_queue.put(('done', None, None))
+
+        self.worker = threading.Thread(target=target, daemon=True)
+        self.worker.start()
+        self.root.after(50, self.poll_queue)
+
+    def poll_queue(self):
+        """Забирает сообщения рабочего потока и обновляет окно; перепланирует себя, пока поток работает."""
+        try:
+            while True:
+                message = self.task_queue.get_nowait()
+                kind = message[0]
+                if kind == 'progress':
+                    done, total = message[1], message[2]
+                    self.progress_bar.stop()
+                    self.progress_bar.config(mode="determinate", maximum=max(total, 1), value=done)
+                    self.progress_label.config(text=f"{done}/{total}")
+                elif kind == 'error':
+                    messagebox.showerror(message[1], message[2])
+                elif kind == 'done':
+                    self.finish_background()
+                    on_done, result = message[1], message[2]
+                    if on_done is not None:
+                        on_done(result)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(50, self.poll_queue)
+
+    def finish_background(self):
+        """Возвращает кнопки и индикатор прогресса в исходное состояние."""
+        self.worker = None
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_label.config(text="")
+        self.start_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+
+    def cancel_processing(self):
+        if self.worker is not None and self.worker.is_alive():
+            self.cancel_event.set()
+            self.cancel_button.config(state="disabled")
+            self.progress_label.config(text="Отмена...")
+            logging.info("Запрошена отмена сохранения")
+
+    def load_file(self, file_path):
+        """Парсит и разделяет файл в фоне, затем показывает нужные чекбоксы."""
+        def work():
+            parsed, cached = self.parsed_cache.load(file_path)
+            return parsed
+
+        self.run_in_background(work, self.on_file_loaded, "Чтение...")
+
+    def on_file_loaded(self, parsed):
+        if parsed is None:
+            return
+        self.headers, self.styles, self.events = parsed.headers, parsed.styles, parsed.events
+        self.actors, self.group_lines, self.multiple_actor_lines, self.excluded_actor_lines, self.sign_lines, has_group_lines, has_multiple_actors, has_excluded_actors, has_sign_lines, self.all_actors = parsed.classification.as_tuple()
+        self.actor_index = parsed.classification.actor_index
+        self.show_group_option.set(has_group_lines)
+        self.show_multiple_option.set(has_multiple_actors or has_excluded_actors)
+        self.show_signs_option.set(has_sign_lines)
+        self.group_check.grid_forget()
+        self.multiple_check.grid_forget()
+        self.signs_check.grid_forget()
+        window_height = 260 + SAVE_OPTIONS_HEIGHT
+        if has_group_lines:
+            self.group_check.grid(row=3, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+            window_height += 25
+        if has_multiple_actors or has_excluded_actors:
+            self.multiple_check.grid(row=4, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+            window_height += 25
+        if has_sign_lines:
+            self.signs_check.grid(row=5, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+            window_height += 25
+        self.root.geometry(f"450x{window_height}")
+        logging.info(f"Окно установлено в размер 450x{window_height}")
+
+    def start_processing(self):
+        if self.is_busy():
+            return
+        file_path = self.file_path_var.get()
+        if not file_path or file_path == os.path.expanduser("~/Desktop"):
+            messagebox.showerror("Ошибка", "Укажите путь к .ass файлу.")
+            return
+        if not os.path.isfile(file_path):
+            messagebox.showerror("Ошибка", "Указанный .ass файл не существует.")
+            return
+        if not file_path.lower().endswith('.ass'):
+            messagebox.showerror("Ошибка", "Файл должен иметь расширение .ass.")
+            return
+        if self.actors is None:
+            messagebox.showerror("Ошибка", "Сначала выберите .ass файл.")
+            return
+        original_filename = os.path.splitext(os.path.basename(file_path))[0]
+        output_dir = os.path.join(os.path.dirname(file_path), 'Subtitles_by_Actor')
+        export_format = self.format_var.get()
+        distribute_group = bool(self.distribute_group_var.get()) if self.show_group_option.get() else False
+        distribute_multiple = bool(self.distribute_multiple_var.get()) if self.show_multiple_option.get() else False
+        save_signs_ass = bool(self.save_signs_ass_var.get()) if self.show_signs_option.get() else False
+        bundle = 'zip' if self.bundle_var.get() else None
+        incremental = bool(self.incremental_var.get()) and bundle is None
+        logging.info(f"Запуск обработки: файл {file_path}, формат {export_format}, папка {output_dir}, save_signs_ass={save_signs_ass}, incremental={incremental}, bundle={bundle}")
+        total = count_output_files(self.actors, self.group_lines, self.multiple_actor_lines, self.excluded_actor_lines, self.sign_lines, distribute_group, distribute_multiple, save_signs_ass)
+        headers, styles, actors, group_lines, multiple_actor_lines, excluded_actor_lines, sign_lines, all_actors, actor_index = self.headers, self.styles, self.actors, self.group_lines, self.multiple_actor_lines, self.excluded_actor_lines, self.sign_lines, self.all_actors, self.actor_index
+
+        def work():
+            return save_actor_files(headers, styles, actors, group_lines, multiple_actor_lines, excluded_actor_lines, sign_lines, output_dir, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass, all_actors,
+                                    progress=lambda done, total: self.task_queue.put(('progress', done, total)), cancel_event=self.cancel_event, actor_index=actor_index, incremental=incremental,
+                                    bundle=bundle, compress=bundle is not None)
+
+        def on_done(written):
+            if written is None:
+                return
+            if self.cancel_event.is_set():
+                messagebox.showinfo("Отменено", "Сохранение отменено, файлы в папке с результатами не изменены.")
+                return
+            self.show_completion_dialog(output_dir)
+
+        self.run_in_background(work, on_done, f"0/{total}")
+        self.cancel_button.config(state="normal")
+
+    def show_completion_dialog(self, output_dir):
+        logging.info("Открытие окна 'Сохранение завершено'")
+        dialog = Toplevel(self.root)
+        dialog.title("Сохранение завершено")
+        dialog.geometry("400x250")
+        dialog.configure(bg="#eceff1")
+        try:
+            dialog.iconbitmap(resource_path("favicon.ico"))
+        except Exception as e:
+            logging.warning(f"Не удалось установить иконку: {e}")
+        dialog_frame = Frame(dialog, bg="#ffffff", bd=2, relief="flat", highlightbackground="#b0bec5", highlightcolor="#b0bec5", highlightthickness=2)
+        dialog_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        Label(dialog_frame, text="Сохранение завершено", font=("Arial", 12, "bold"), bg="#ffffff", fg="black").pack(pady=5)
+        Label(dialog_frame, text="Субтитры успешно сохранены:", font=("Arial", 10), bg="#ffffff", fg="black").pack(pady=5)
+        path_entry = Text(dialog_frame, height=3, width=40, wrap="word", font=("Arial", 9), bg="#f5f5f5", fg="black", relief="sunken", borderwidth=1)
+        path_entry.insert("end", output_dir)
+        path_entry.bind("<Key>", lambda e: "break")
+        path_entry.pack(pady=5)
+        path_entry.bind("<Button-3>", self.show_context_menu)
+        path_entry.bind("<Control-c>", self.copy_text)
+        path_entry.bind("<Control-v>", self.paste_text)
+        path_entry.bind("<Control-a>", self.select_all_text)
+        copy_button = Button(dialog_frame, text="Копировать путь", font=("Arial", 9), bg="#4CAF50", fg="white", activebackground="#45a049", activeforeground="white", relief="raised", borderwidth=2, command=lambda: [self.root.clipboard_clear(), self.root.clipboard_append(output_dir), logging.info(f"Путь скопирован: {output_dir}")])
+        copy_button.pack(pady=5)
+        button_frame = Frame(dialog_frame, bg="#ffffff")
+        button_frame.pack(fill="x", pady=5, side="bottom")
+        close_button = Button(button_frame, text="Закрыть", font=("Arial", 9), bg="#d32f2f", fg="white", activebackground="#c62828", activeforeground="white", relief="raised", borderwidth=2, command=dialog.destroy)
+        close_button.pack(side="right", padx=5, ipadx=10)
+        new_file_button = Button(button_frame, text="Новый файл", font=("Arial", 9), bg="#0288d1", fg="white", activebackground="#0277bd", activeforeground="white", relief="raised", borderwidth=2, command=lambda: [dialog.destroy(), self.choose_file()])
+        new_file_button.pack(side="right", padx=5, ipadx=10)
+
+        dialog.update_idletasks()
+        width = dialog.winfo_reqwidth()
+        height = dialog.winfo_reqheight()
+        x = (dialog.winfo_screenwidth() // 2) - (width // 2)
+        y = (dialog.winfo_screenheight() // 2) - (height // 2)
+        dialog.geometry(f"{width}x{height}+{x}+{y}")
+        dialog.lift()
+        logging.info(f"Окно 'Сохранение завершено' центрировано: {width}x{height}+{x}+{y}")
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    logging.info("Запуск программы")
+    try:
+        from tkinterdnd2 import TkinterDnD
+        root = TkinterDnD.Tk()
+    except ImportError:
+        logging.error("Библиотека tkinterdnd2 не установлена. Drag-and-drop не будет работать.")
+        root = Tk()
+    app = SubtitleSplitterApp(root)
+    set_error_handler(app.report_error)
+    root.mainloop()
@@ -0,0 +1,91 @@
+import os
+import json
+import hashlib
+import logging
+
+from .writers import write_atomic
+
+def content_hash(data):
+    """Хеш содержимого выходного файла."""
+    return hashlib.sha1(data).hexdigest()
+
+def output_key(output):
+    """Устойчивый ключ выходного файла, не зависящий от числа строк в имени."""
+    return f"{output.kind}|{output.label}|{output.export_format}"
+
+class OutputManifest:
+    """Манифест инкрементального режима для одного эпизода в папке Subtitles_by_Actor.
+
+    Хранит для каждого выходного файла его имя и хеш содержимого, чтобы при повторном
+    разделении перезаписывать только изменившиеся файлы и удалять устаревшие (например,
+    файл актера со старым числом строк в имени). У каждого эпизода свой манифест, поэтому
+    параллельная обработка разных эпизодов в одной папке не конфликтует.
+    """
+
+    def __init__(self, output_dir, original_filename):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, f".{original_filename}.manifest.json")
+        self.entries = {}
+        self.seen = set()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            self.entries = {key: entry for key, entry in data.get('outputs', {}).items() if 'file' in entry and 'hash' in entry}
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logging.warning(f"Не удалось прочитать манифест {self.path}, все файлы будут перезаписаны: {e}")
+            self.entries = {}
+        return self
+
+    def unique_key(self, output):
+        """Ключ выходного файла; повторяющиеся подписи (одинаковые наборы ролей) нумеруются."""
+        base = key = output_key(output)
+        number = 1
+        while key in self.seen:
+            number += 1
+            key = f"{base}#{number}"
+        self.seen.add(key)
+        return key
+
+    def is_current(self, key, file_name, digest):
+        entry = self.entries.get(key)
+        return (entry is not None and entry['file'] == file_name and entry['hash'] == digest
+                and os.path.isfile(os.path.join(self.output_dir, file_name)))
+
+    def record(self, key, file_name, digest):
+        """Запоминает файл; возвращает прежнее имя файла этого ключа, если оно было другим."""
+        previous = self.entries.get(key)
+        self.entries[key] = {'file': file_name, 'hash': digest}
+        if previous is not None and previous['file'] != file_name:
+            return previous['file']
+        return None
+
+    def remove_stale(self, keep_files=()):
+        """Удаляет файлы, которые были в манифесте, но не получены в этом запуске."""
+        removed = []
+        keep_files = set(keep_files) | {entry['file'] for key, entry in self.entries.items() if key in self.seen}
+        for key in [key for key in self.entries if key not in self.seen]:
+            file_name = self.entries.pop(key)['file']
+            if file_name not in keep_files and remove_output(self.output_dir, file_name):
+                removed.append(file_name)
+        return removed
+
+    def save(self):
+        data = {'version': 1, 'outputs': self.entries}
+        write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=1).encode('utf-8'))
+
+def remove_output(output_dir, file_name):
+    """Удаляет устаревший выходной файл; True, если файл был удален."""
+    path = os.path.join(output_dir, file_name)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logging.warning(f"Не удалось удалить устаревший файл {path}: {e}")
+        return False
+    logging.info(f"Удален устаревший файл: {path}")
+    return True
@@ -0,0 +1,135 @@
+import re
+import mmap
+import codecs
+import logging
+
+from .events import Event
+
+# Секции, которые нужны для разделения; остальные ([Fonts], [Graphics], [Aegisub Project Garbage] ...)
+# пропускаются без декодирования
+SCRIPT_INFO = '[Script Info]'
+STYLES = '[V4+ Styles]'
+EVENTS = '[Events]'
+WANTED_SECTIONS = (SCRIPT_INFO, STYLES, EVENTS)
+# Вложения: ради их пропуска и нужен разбор через mmap
+ATTACHMENT_SECTIONS = (b'[Fonts]', b'[Graphics]')
+# Секция [Events] декодируется блоками примерно такого размера, а не целиком
+DECODE_BLOCK = 1024 * 1024
+# Строка заголовка секции: '[' после необязательных пробелов в начале строки
+_HEADER_RE = re.compile(rb'\n[ \t\f\v]*\[')
+_FIRST_HEADER_RE = re.compile(rb'[ \t\f\v]*\[')
+
+def _section_bounds(data, start):
+    """Отдает (заголовок секции в байтах, начало тела, конец тела) для каждой строки, начинающейся с '['.
+
+    Как и в построчном разборе, перед '[' допускаются пробелы и табуляция.
+    """
+    match = _FIRST_HEADER_RE.match(data, start)
+    if match is not None:
+        pos = start
+    else:
+        match = _HEADER_RE.search(data, start)
+        pos = -1 if match is None else match.start() + 1
+    while pos != -1 and pos < len(data):
+        header_end = data.find(b'\n', pos)
+        if header_end == -1:
+            header_end = len(data)
+        match = _HEADER_RE.search(data, header_end)
+        body_end = len(data) if match is None else match.start()
+        yield data[pos:header_end], header_end + 1, body_end
+        pos = -1 if match is None else match.start() + 1
+
+def attachment_size(file_path, limit=None):
+    """Оценка суммарного размера секций [Fonts] и [Graphics] в байтах.
+
+    Заголовки и конец секции ищутся mmap.find, без декодирования; заголовки с отступом не учитываются.
+    С limit поиск прекращается, как только набрано limit байт (возвращается limit).
+    """
+    with open(file_path, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return 0
+        with data:
+            total = 0
+            for section in ATTACHMENT_SECTIONS:
+                header = b'\n' + section
+                pos = data.find(header)
+                while pos != -1:
+                    stop = len(data) if limit is None else min(len(data), pos + limit - total)
+                    end = data.find(b'\n[', pos + len(header), stop)
+                    if end == -1:
+                        end = stop
+                    total += end - pos
+                    if limit is not None and total >= limit:
+                        return limit
+                    pos = data.find(header, end)
+            return total
+
+def _iter_lines(data, start, end):
+    """Отдает непустые строки (без пробелов по краям) из байтов data[start:end], декодируя блоками."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while start < end:
+        stop = min(end, start + DECODE_BLOCK)
+        if stop < end:
+            newline = data.rfind(b'\n', start, stop)
+            if newline != -1:
+                stop = newline + 1
+        text = decoder.decode(data[start:stop], final=stop >= end)
+        start = stop
+        if '\r' in text:
+            # Как и текстовый режим open(): одиночный \r тоже считается концом строки
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        for line in text.split('\n'):
+            line = line.strip()
+            if line:
+                yield line
+
+def iter_mapped_events(file_path, headers, styles):
+    """То же, что iter_ass_file, но через mmap: секции ищутся mmap.find, вложения не декодируются.
+
+    Время разбора пропорционально размеру [Script Info], [V4+ Styles] и [Events],
+    а не шрифтов и картинок, встроенных в скрипт.
+    """
+    index = 0
+    with open(file_path, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Пустой файл нельзя отобразить в память
+            return
+        with data:
+            if data.find(b'\n', 0, DECODE_BLOCK) == -1 and data.find(b'\r', 0, DECODE_BLOCK) != -1:
+                # Строки разделены одиночным \r (старый формат Mac) — границы секций по \n не найти
+                from .core import _iter_text_events
+                yield from _iter_text_events(file_path, headers, styles)
+                return
+            start = len(codecs.BOM_UTF8) if data[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+            headers_count, styles_count = len(headers), len(styles)
+            found_events = False
+            for raw_header, body_start, body_end in _section_bounds(data, start):
+                section = raw_header.decode('utf-8').strip()
+                if section not in WANTED_SECTIONS:
+                    logging.debug(f"Пропущена секция {section}: {body_end - body_start} байт")
+                    continue
+                if section == SCRIPT_INFO:
+                    headers.extend(_iter_lines(data, body_start, body_end))
+                elif section == STYLES:
+                    styles.extend(_iter_lines(data, body_start, body_end))
+                else:
+                    found_events = True
+                    for line in _iter_lines(data, body_start, body_end):
+                        if line.startswith('Dialogue:'):
+                            event = Event.parse(line, index)
+                            if event is None:
+                                logging.warning(f"Пропущена некорректная строка: {line}")
+                                continue
+                            index += 1
+                            yield event
+            if not found_events:
+                # Заголовок [Events] не распознан по байтам (например, перед '[' стоит неразрывный пробел):
+                # построчный разбор находит секции так же, как и для небольших файлов
+                logging.debug(f"Секция {EVENTS} не найдена через mmap, файл разбирается построчно: {file_path}")
+                del headers[headers_count:], styles[styles_count:]
+                from .core import _iter_text_events
+                yield from _iter_text_events(file_path, headers, styles)
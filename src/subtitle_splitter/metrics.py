@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+
+from .writers import write_atomic
+
+# Сколько функций (cProfile) и мест выделения памяти (tracemalloc) попадает в отчет
+PROFILE_TOP = 25
+PROFILE_MODES = ('cpu', 'memory')
+
+class RunMetrics:
+    """Таймеры фаз, счетчики и выборки задержек одного прогона; безопасно для потоков записи."""
+
+    def __init__(self):
+        self.timers = {}
+        self.counters = {}
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Замеряет время блока и добавляет его к таймеру name."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.timers[name] = self.timers.get(name, 0.0) + elapsed
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        with self._lock:
+            self.samples.setdefault(name, []).append(value)
+
+    def report(self):
+        return {
+            'timers_ms': {name: round(seconds * 1000, 3) for name, seconds in self.timers.items()},
+            'counters': dict(self.counters),
+            'latency_ms': {name: summarize(values) for name, values in self.samples.items()},
+        }
+
+class NullMetrics:
+    """Заглушка, пока метрики не включены: ничего не замеряет и почти ничего не стоит."""
+
+    def phase(self, name):
+        return nullcontext()
+
+    def count(self, name, value=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+NULL_METRICS = NullMetrics()
+_active = NULL_METRICS
+
+def active_metrics():
+    """Метрики текущего прогона (NullMetrics, если они не собираются)."""
+    return _active
+
+def set_metrics(metrics):
+    """Включает сбор метрик в metrics (RunMetrics) или выключает его (None)."""
+    global _active
+    _active = metrics if metrics is not None else NULL_METRICS
+
+def summarize(values):
+    """Число, сумма, минимум, среднее, 95-й перцентиль и максимум выборки (в миллисекундах)."""
+    values = sorted(values)
+    count = len(values)
+    return {
+        'count': count,
+        'total': round(sum(values) * 1000, 3),
+        'min': round(values[0] * 1000, 3),
+        'avg': round(sum(values) / count * 1000, 3),
+        'p95': round(values[min(count - 1, int(count * 0.95))] * 1000, 3),
+        'max': round(values[-1] * 1000, 3),
+    }
+
+class Profiler:
+    """Необязательный профиль прогона: 'cpu' — cProfile, 'memory' — tracemalloc."""
+
+    def __init__(self, mode):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Неизвестный режим профилирования: {mode}")
+        self.mode = mode
+        self._profile = None
+
+    def start(self):
+        if self.mode == 'cpu':
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            import tracemalloc
+            tracemalloc.start()
+        return self
+
+    def stop(self, stats_path=None):
+        """Останавливает профиль и возвращает его сводку для отчета; cProfile сохраняется в stats_path."""
+        if self.mode == 'cpu':
+            import pstats
+            self._profile.disable()
+            if stats_path is not None:
+                self._profile.dump_stats(stats_path)
+            stats = pstats.Stats(self._profile)
+            top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+            return {
+                'mode': 'cpu',
+                'stats_file': stats_path,
+                'top_cumulative': [{'function': f"{path}:{line}({name})", 'calls': calls, 'own_ms': round(own * 1000, 3), 'cumulative_ms': round(cumulative * 1000, 3)}
+                                   for (path, line, name), (_, calls, own, cumulative, _) in top],
+            }
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            'mode': 'memory',
+            'current_mb': round(current / (1024 * 1024), 3),
+            'peak_mb': round(peak / (1024 * 1024), 3),
+            'top_allocations': [{'where': str(stat.traceback), 'size_kb': round(stat.size / 1024, 1), 'count': stat.count}
+                                for stat in snapshot.statistics('lineno')[:PROFILE_TOP]],
+        }
+
+def report_path(output_dir, original_filename, suffix='report.json'):
+    """Путь к отчету эпизода: скрытый файл в папке с результатами, рядом с манифестом."""
+    return os.path.join(output_dir, f".{original_filename}.{suffix}")
+
+@contextmanager
+def record_run(output_dir, original_filename, report=False, profile=None, extra=None):
+    """Собирает метрики (и профиль) блока и пишет JSON-отчет в папку с результатами.
+
+    При report=False и profile=None ничего не делает. extra — словарь, который можно дополнить
+    внутри блока (например, итогом обработки); он попадает в отчет как есть.
+    """
+    if not report and profile is None:
+        yield None
+        return
+    metrics = RunMetrics()
+    profiler = Profiler(profile).start() if profile is not None else None
+    set_metrics(metrics)
+    started = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        set_metrics(None)
+        elapsed = time.perf_counter() - started
+        data = {'source': original_filename, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'total_ms': round(elapsed * 1000, 3), **metrics.report()}
+        if extra:
+            data.update(extra)
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            logging.warning(f"Не удалось создать папку {output_dir} для отчета: {e}")
+        if profiler is not None:
+            stats_path = report_path(output_dir, original_filename, 'prof') if profile == 'cpu' and os.path.isdir(output_dir) else None
+            data['profile'] = profiler.stop(stats_path)
+        path = report_path(output_dir, original_filename)
+        try:
+            write_atomic(path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+            logging.info("Отчет о прогоне сохранен: %s", path)
+        except Exception as e:
+            logging.warning(f"Не удалось сохранить отчет о прогоне {path}: {e}")
@@ -0,0 +1,96 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+
+# Префикс скрытых временных папок внутри Subtitles_by_Actor
+STAGING_PREFIX = '.staging-'
+# Временные папки старше этого возраста остались от упавших запусков и удаляются
+STALE_STAGING_AGE = 24 * 60 * 60
+
+def fsync_file(path):
+    with open(path, 'rb') as file:
+        os.fsync(file.fileno())
+
+def fsync_dir(path):
+    """Сбрасывает на диск записи каталога (переименования); на Windows каталог так открыть нельзя."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class StagedOutput:
+    """Временная папка для файлов одного запуска и их публикация в output_dir.
+
+    Все файлы сначала пишутся в скрытую папку .staging-<эпизод>-XXXX внутри output_dir (та же
+    файловая система) с fsync (writers.write_bytes) и только после этого переносятся на место через
+    os.replace. Прерванный запуск оставляет прежние файлы нетронутыми, а параллельные запуски
+    того же эпизода пишут каждый в свою папку и заменяют файлы целиком.
+    """
+
+    def __init__(self, output_dir, tag):
+        self.output_dir = output_dir
+        self.tag = tag
+        self.path = None
+
+    def create(self):
+        """Создает output_dir и временную папку; заодно проверяет право записи (OSError при отказе)."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        remove_stale_staging(self.output_dir)
+        self.path = tempfile.mkdtemp(prefix=f"{STAGING_PREFIX}{self.tag}-", dir=self.output_dir)
+        return self
+
+    def staged_path(self, file_name):
+        return os.path.join(self.path, file_name)
+
+    def publish(self, file_names, fsync=False):
+        """Атомарно переносит записанные файлы в output_dir.
+
+        Возвращает (перенесенные пути, ошибки) — ошибки как список (номер, путь, исключение):
+        файл в output_dir может быть занят другой программой (например, открыт в REAPER на Windows),
+        тогда остальные файлы все равно переносятся. fsync=True — сначала сбросить файлы на диск,
+        если они писались без fsync (потоковый режим).
+        """
+        if fsync:
+            for file_name in file_names:
+                fsync_file(self.staged_path(file_name))
+        published = []
+        errors = []
+        for number, file_name in enumerate(file_names):
+            target = os.path.join(self.output_dir, file_name)
+            try:
+                os.replace(self.staged_path(file_name), target)
+                published.append(target)
+            except OSError as e:
+                logging.error(f"Не удалось заменить файл {target}: {e}")
+                errors.append((number, target, e))
+        fsync_dir(self.output_dir)
+        return published, errors
+
+    def discard(self):
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
+
+def remove_stale_staging(output_dir, max_age=STALE_STAGING_AGE):
+    """Удаляет временные папки, оставшиеся от давно упавших запусков."""
+    now = time.time()
+    try:
+        entries = list(os.scandir(output_dir))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith(STAGING_PREFIX) and entry.is_dir():
+            try:
+                if now - entry.stat().st_mtime > max_age:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    logging.info(f"Удалена временная папка прерванного запуска: {entry.path}")
+            except OSError:
+                pass
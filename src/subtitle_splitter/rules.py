@@ -0,0 +1,167 @@
+import re
+import json
+import hashlib
+import logging
+
+from .config import settings_path
+from .aliases import load_confirmed_aliases
+
+# Виды строк по полю Name
+KIND_ACTOR = 'actor'
+KIND_MULTIPLE = 'multiple'
+KIND_EXCLUDED = 'excluded'
+KIND_GROUP = 'group'
+KIND_SIGN = 'sign'
+
+# Правила по умолчанию; в settings.json их можно переопределить ключом "name_rules".
+# Ключевые слова сравниваются без учета регистра, поэтому 'SIGN', 'Sign' и 'sign' — одна метка.
+DEFAULT_RULES = {
+    'group_keywords': ['гуры', 'все'],
+    'sign_labels': ['надпись', 'надписи', 'текст', 'sign', 'signs', 'text'],
+    'exclusion_prefix': '!',
+    'separators': [',', ';'],
+    'strip_chars': '{}',
+    'aliases': {},
+    # Приведение регистра переименовывает выходные файлы ('МС' → 'Мс'), поэтому включается только явно
+    'normalize_case': False,
+}
+
+class NameRules:
+    """Скомпилированные правила разбора поля Name: группы, надписи, исключения, разделители и псевдонимы.
+
+    Ключевые слова собираются в один словарь по casefold(), разделители — в одно регулярное
+    выражение, удаляемые символы — в таблицу str.translate. Результат разбора каждого значения
+    Name кешируется, так что на строку приходится один поиск в словаре.
+    """
+
+    def __init__(self, group_keywords=None, sign_labels=None, exclusion_prefix=None, separators=None, strip_chars=None, aliases=None, normalize_case=None):
+        config = dict(DEFAULT_RULES)
+        for name, value in (('group_keywords', group_keywords), ('sign_labels', sign_labels), ('exclusion_prefix', exclusion_prefix),
+                            ('separators', separators), ('strip_chars', strip_chars), ('aliases', aliases), ('normalize_case', normalize_case)):
+            if value is not None:
+                config[name] = value
+        self.config = config
+        self.keywords = {label.strip().casefold(): KIND_SIGN for label in config['sign_labels']}
+        # Как и раньше, проверка на 'гуры/все' идет первой
+        self.keywords.update((keyword.strip().casefold(), KIND_GROUP) for keyword in config['group_keywords'])
+        self.exclusion_prefix = config['exclusion_prefix']
+        self._strip_table = str.maketrans('', '', config['strip_chars'])
+        separators = [separator for separator in config['separators'] if separator]
+        self._split_re = re.compile('|'.join(map(re.escape, separators))) if separators else None
+        self.aliases = {' '.join(alias.split()).casefold(): canonical.strip() for alias, canonical in config['aliases'].items()}
+        self.normalize_case = config['normalize_case']
+        self.fingerprint = hashlib.sha1(json.dumps(config, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+        self._cache = {}
+        self._canonical = {}
+
+    @classmethod
+    def from_settings(cls, settings, extra_aliases=None):
+        """Строит правила из словаря настроек (ключ "name_rules"); неверные значения заменяются умолчаниями.
+
+        extra_aliases (подтвержденные псевдонимы из aliases.json) дополняют name_rules.aliases,
+        псевдонимы из настроек важнее.
+        """
+        options = settings.get('name_rules') or {}
+        if not isinstance(options, dict):
+            logging.warning("Ключ name_rules в настройках должен быть объектом, используются правила по умолчанию")
+            options = {}
+        kwargs = {}
+        for name, default in DEFAULT_RULES.items():
+            if name not in options:
+                continue
+            value = options[name]
+            if isinstance(default, list):
+                valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+            elif isinstance(default, bool):
+                valid = isinstance(value, bool)
+            elif isinstance(default, dict):
+                valid = isinstance(value, dict) and all(isinstance(key, str) and isinstance(item, str) for key, item in value.items())
+            else:
+                valid = isinstance(value, str)
+            if valid:
+                kwargs[name] = value
+            else:
+                logging.warning(f"Некорректное значение name_rules.{name} в настройках, используется значение по умолчанию")
+        for name in options.keys() - DEFAULT_RULES.keys():
+            logging.warning(f"Неизвестный ключ name_rules.{name} в настройках пропущен")
+        if extra_aliases:
+            kwargs['aliases'] = {**extra_aliases, **kwargs.get('aliases', {})}
+        return cls(**kwargs)
+
+    def split_actors(self, text):
+        """Делит список актеров по разделителям, убирает лишние символы и подставляет псевдонимы."""
+        text = text.translate(self._strip_table)
+        parts = self._split_re.split(text) if self._split_re is not None else [text]
+        actors = []
+        for part in parts:
+            part = part.strip()
+            if part:
+                actors.append(self.canonical(part))
+        return actors
+
+    def canonical(self, actor):
+        """Каноническое имя актера (с кешем): псевдоним, иначе имя со схлопнутыми пробелами,
+        а при normalize_case написанное целиком строчными или прописными — с заглавной буквы."""
+        canonical = self._canonical.get(actor)
+        if canonical is None:
+            collapsed = ' '.join(actor.split())
+            canonical = self.aliases.get(collapsed.casefold())
+            if canonical is None:
+                # 'unknown' — метка строк без имени, ее не трогаем
+                if self.normalize_case and collapsed != 'unknown' and (collapsed.islower() or collapsed.isupper()):
+                    canonical = collapsed.title()
+                else:
+                    canonical = collapsed
+            self._canonical[actor] = canonical
+        return canonical
+
+    def parse(self, actor_field):
+        """Разбирает поле Name в (вид строки, список актеров, актеры для all_actors)."""
+        parsed = self._cache.get(actor_field)
+        if parsed is None:
+            parsed = self._cache[actor_field] = self._parse(actor_field)
+        return parsed
+
+    def _parse(self, actor_field):
+        actor_field = actor_field.strip()
+        kind = self.keywords.get(actor_field.casefold())
+        if kind is not None:
+            return kind, None, ()
+        if self.exclusion_prefix and actor_field.startswith(self.exclusion_prefix):
+            excluded_actors = self.split_actors(actor_field[len(self.exclusion_prefix):])
+            return KIND_EXCLUDED, excluded_actors or ["unknown"], tuple(excluded_actors)
+        actors_list = self.split_actors(actor_field)
+        if not actors_list:
+            return KIND_ACTOR, ["unknown"], ()
+        return (KIND_MULTIPLE if len(actors_list) > 1 else KIND_ACTOR), actors_list, tuple(actors_list)
+
+def load_rules(path=None, aliases_file=None):
+    """Читает правила из settings.json (по умолчанию settings_path()) и подтвержденные псевдонимы
+    из aliases.json; без файлов — правила по умолчанию."""
+    path = path or settings_path()
+    confirmed = load_confirmed_aliases(aliases_file)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            settings = json.load(file)
+    except FileNotFoundError:
+        settings = {}
+    except Exception as e:
+        logging.warning(f"Не удалось прочитать правила из {path}, используются правила по умолчанию: {e}")
+        settings = {}
+    if not isinstance(settings, dict):
+        settings = {}
+    return NameRules.from_settings(settings, confirmed)
+
+_default_rules = None
+
+def default_rules():
+    """Правила из настроек пользователя, загружаемые один раз на процесс."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = load_rules()
+    return _default_rules
+
+def set_default_rules(rules):
+    """Подменяет правила по умолчанию (None — перечитать из настроек при следующем обращении)."""
+    global _default_rules
+    _default_rules = rules
@@ -0,0 +1,290 @@
+import os
+import logging
+from collections import OrderedDict
+
+from .core import (iter_ass_file, parse_name_field, combination_key, safe_file_name, show_error, report_write_errors,
+                   KIND_ACTOR, KIND_GROUP, KIND_SIGN, KIND_EXCLUDED, KIND_MULTIPLE)
+from .writers import AssHeader, EOL, reset_style_names, srt_guard, srt_entry
+from .publish import StagedOutput
+
+# Сколько выходных файлов держать открытыми одновременно
+DEFAULT_MAX_OPEN_FILES = 64
+# Построчное чтение: страницы mmap-файла попадают в RSS процесса, и на многочасовых
+# транскриптах память перестала бы быть постоянной
+STREAM_BACKEND = 'text'
+# Как часто (в строках) сообщать о прогрессе и проверять отмену
+PROGRESS_EVERY = 1000
+
+class NameStats:
+    """Сводка по одному значению поля Name за первый проход: разбор, число строк и стили."""
+    __slots__ = ('kind', 'actors', 'count', 'styles')
+
+    def __init__(self, kind, actors):
+        self.kind = kind
+        self.actors = actors
+        self.count = 0
+        self.styles = set()
+
+class StreamPlan:
+    """Результат первого прохода: заголовки, стили и сводка по каждому встреченному полю Name.
+
+    Памяти нужно столько, сколько различных значений Name в файле, а не строк Dialogue.
+    """
+
+    def __init__(self):
+        self.headers = []
+        self.styles = []
+        self.names = {}
+        self.event_count = 0
+
+    def scan(self, file_path, backend=STREAM_BACKEND):
+        names = self.names
+        for event in iter_ass_file(file_path, self.headers, self.styles, backend):
+            self.event_count += 1
+            stats = names.get(event.name)
+            if stats is None:
+                kind, actors_list, _ = parse_name_field(event.name)
+                stats = names[event.name] = NameStats(kind, actors_list)
+            stats.count += 1
+            stats.styles.add(event.style.strip())
+            if '\\r' in event.text:
+                stats.styles.update(reset_style_names(event.text))
+        return self
+
+    def of_kind(self, kind):
+        return [stats for stats in self.names.values() if stats.kind == kind]
+
+    def actor_names(self):
+        """Актеры, для которых будут созданы файлы, в порядке первого появления."""
+        return list(dict.fromkeys(stats.actors[0] for stats in self.of_kind(KIND_ACTOR)))
+
+class FileHandlePool:
+    """LRU открытых файлов: при превышении max_open закрывается давно не использованный.
+
+    Первый раз файл открывается на перезапись, повторно — на дозапись.
+    """
+
+    def __init__(self, max_open=DEFAULT_MAX_OPEN_FILES):
+        self.max_open = max(1, max_open)
+        self._handles = OrderedDict()
+        self._opened = set()
+
+    def get(self, path):
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+        while len(self._handles) >= self.max_open:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        handle = open(path, 'ab' if path in self._opened else 'wb')
+        self._opened.add(path)
+        self._handles[path] = handle
+        return handle
+
+    def close_all(self):
+        while self._handles:
+            _, handle = self._handles.popitem(last=False)
+            handle.close()
+
+class StreamWriter:
+    """Выходной файл, в который строки дописываются по мере чтения исходника."""
+
+    def __init__(self, pool, path, label, export_format, header_bytes):
+        self.pool = pool
+        self.path = path
+        self.label = label
+        self.export_format = export_format
+        self.header_bytes = header_bytes
+        self.count = 0
+        self.first_number = 1
+        self.failed = False
+
+    def write(self, event):
+        if self.failed:
+            return
+        try:
+            file = self.pool.get(self.path)
+            if self.export_format == 'srt':
+                # Защитный субтитр зависит от начала первой реплики, поэтому пишется вместе с ней
+                guard = ''
+                if self.count == 0:
+                    guard = srt_guard(event.start)
+                    self.first_number = 2 if guard else 1
+                text = guard + srt_entry(self.count + self.first_number, event)
+                if EOL != '\n':
+                    text = text.replace('\n', EOL)
+                file.write(text.encode('utf-8'))
+            else:
+                if self.count == 0:
+                    file.write(self.header_bytes)
+                file.write((event.to_ass() + EOL).encode('utf-8'))
+            self.count += 1
+        except Exception as e:
+            self.failed = True
+            logging.error(f"Ошибка при сохранении файла {self.path}: {e}")
+            show_error("Ошибка", f"Не удалось сохранить файл {self.path}: {e}")
+
+def stream_actor_files(file_path, output_dir, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass,
+                       max_open_files=DEFAULT_MAX_OPEN_FILES, progress=None, cancel_event=None, backend=STREAM_BACKEND, plan=None):
+    """Потоковый вариант parse_ass_file → split_events → save_actor_files с постоянной памятью.
+
+    Первый проход собирает только сводку по полю Name (StreamPlan), из которой заранее известны
+    все выходные файлы, число строк в их именах и используемые стили. Второй проход читает строки
+    Dialogue лениво и сразу дописывает каждую во все файлы, которым она адресована (строки
+    'гуры/все' и исключений — во многие файлы сразу). Открыто не больше max_open_files файлов.
+    Строки пишутся в порядке исходного файла. Готовый plan можно передать, чтобы не сканировать
+    файл повторно. Возвращает список записанных путей (None при ошибке).
+    """
+    if export_format not in ('ass', 'srt'):
+        logging.error(f"Недопустимый формат: {export_format}")
+        show_error("Ошибка", f"Недопустимый формат: {export_format}")
+        return None
+
+    try:
+        if plan is None:
+            logging.info(f"Потоковая обработка, первый проход: {file_path}")
+            plan = StreamPlan().scan(file_path, backend)
+    except Exception as e:
+        logging.error(f"Ошибка при парсинге файла {file_path}: {e}")
+        show_error("Ошибка", f"Не удалось распарсить файл {file_path}: {e}")
+        return None
+    if not plan.event_count:
+        logging.warning("Не найдено событий в секции [Events]")
+        show_error("Ошибка", "В файле не найдено строк Dialogue.")
+        return None
+
+    staging = StagedOutput(output_dir, safe_file_name(original_filename))
+    try:
+        staging.create()
+    except Exception as e:
+        logging.error(f"Ошибка доступа к папке {output_dir}: {e}")
+        show_error("Ошибка", f"Нет прав доступа для записи в папку {output_dir}: {e}")
+        return None
+    try:
+        return _stream_staged(staging, plan, file_path, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass,
+                              max_open_files, progress, cancel_event, backend)
+    finally:
+        staging.discard()
+
+def _stream_staged(staging, plan, file_path, original_filename, export_format, distribute_group, distribute_multiple, save_signs_ass,
+                   max_open_files, progress, cancel_event, backend):
+    # Файлы актеров: число строк и стили считаются по сводке, как их распределил бы plan_output_files
+    actor_counts = {}
+    actor_styles = {}
+    for stats in plan.of_kind(KIND_ACTOR):
+        actor = stats.actors[0]
+        actor_counts[actor] = actor_counts.get(actor, 0) + stats.count
+        actor_styles.setdefault(actor, set()).update(stats.styles)
+    group_stats = plan.of_kind(KIND_GROUP)
+    multiple_stats = plan.of_kind(KIND_MULTIPLE)
+    multiple_groups = {}
+    for stats in multiple_stats:
+        multiple_groups.setdefault(combination_key(stats.actors), []).append(stats)
+    excluded_groups = {}
+    for stats in plan.of_kind(KIND_EXCLUDED):
+        excluded_groups.setdefault(tuple(sorted(stats.actors)), []).append(stats)
+    sign_stats = plan.of_kind(KIND_SIGN)
+    if not actor_counts and not group_stats and not multiple_stats and not excluded_groups and not sign_stats:
+        logging.error("Нет актеров, событий или надписей для сохранения файлов")
+        show_error("Ошибка", "Не найдено актеров, событий или надписей в файле субтитров.")
+        return None
+
+    shared = []
+    if distribute_group:
+        shared.extend((None, stats) for stats in group_stats)
+    if distribute_multiple:
+        shared.extend((None, stats) for stats in multiple_stats)
+        shared.extend((excluded_key, stats) for excluded_key, group in excluded_groups.items() for stats in group)
+    for actor in actor_counts:
+        for excluded_key, stats in shared:
+            if stats.kind == KIND_MULTIPLE and actor not in stats.actors:
+                continue
+            if stats.kind == KIND_EXCLUDED and actor in excluded_key:
+                continue
+            actor_counts[actor] += stats.count
+            actor_styles[actor].update(stats.styles)
+
+    header = AssHeader(plan.headers, plan.styles)
+    pool = FileHandlePool(max_open_files)
+    writers = []
+
+    def new_writer(kind_label, label, count, styles, output_format=export_format):
+        path = staging.staged_path(f"{original_filename} - {kind_label} - ({count}).{output_format}")
+        writer = StreamWriter(pool, path, label, output_format, header.encode_for_styles(styles) if output_format == 'ass' else None)
+        writers.append(writer)
+        return writer
+
+    actor_writers = {actor: new_writer(safe_file_name(actor), actor, count, actor_styles[actor]) for actor, count in actor_counts.items()}
+    group_writer = None
+    if not distribute_group and group_stats:
+        group_writer = new_writer("Гуры", "гуры/все", sum(stats.count for stats in group_stats), set().union(*(stats.styles for stats in group_stats)))
+    multiple_writers = {}
+    excluded_writers = {}
+    if not distribute_multiple:
+        for combination, group in multiple_groups.items():
+            multiple_writers[combination] = new_writer(" ".join(safe_file_name(actor) for actor in combination), ", ".join(combination),
+                                                       sum(stats.count for stats in group), set().union(*(stats.styles for stats in group)))
+        for excluded_key, group in excluded_groups.items():
+            excluded_writers[excluded_key] = new_writer("Без " + " ".join(safe_file_name(actor) for actor in excluded_key), "без " + ", ".join(excluded_key),
+                                                        sum(stats.count for stats in group), set().union(*(stats.styles for stats in group)))
+    signs_writer = None
+    if save_signs_ass and sign_stats:
+        signs_writer = new_writer("Надписи", "надписи", sum(stats.count for stats in sign_stats), set().union(*(stats.styles for stats in sign_stats)), 'ass')
+    logging.info(f"Потоковая обработка, второй проход: строк {plan.event_count}, файлов {len(writers)}, открытых файлов не больше {pool.max_open}")
+
+    # Для каждого значения Name — список файлов, куда идут его строки
+    targets = {}
+    all_actor_writers = list(actor_writers.values())
+    for name, stats in plan.names.items():
+        if stats.kind == KIND_ACTOR:
+            targets[name] = [actor_writers[stats.actors[0]]]
+        elif stats.kind == KIND_GROUP:
+            targets[name] = all_actor_writers if distribute_group else [group_writer]
+        elif stats.kind == KIND_SIGN:
+            targets[name] = [signs_writer] if signs_writer is not None else []
+        elif stats.kind == KIND_EXCLUDED:
+            excluded_key = tuple(sorted(stats.actors))
+            if distribute_multiple:
+                targets[name] = [writer for actor, writer in actor_writers.items() if actor not in excluded_key]
+            else:
+                targets[name] = [excluded_writers[excluded_key]]
+        elif distribute_multiple:
+            targets[name] = [actor_writers[actor] for actor in dict.fromkeys(stats.actors) if actor in actor_writers]
+        else:
+            targets[name] = [multiple_writers[combination_key(stats.actors)]]
+
+    done = 0
+    failed = False
+    try:
+        for event in iter_ass_file(file_path, [], [], backend):
+            if done % PROGRESS_EVERY == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    logging.info(f"Потоковая обработка отменена после {done} из {plan.event_count} строк")
+                    break
+                if progress is not None and done:
+                    progress(done, plan.event_count)
+            for writer in targets.get(event.name, ()):
+                writer.write(event)
+            done += 1
+    except Exception as e:
+        logging.error(f"Ошибка при потоковой обработке файла {file_path}: {e}")
+        show_error("Ошибка", f"Не удалось обработать файл {file_path}: {e}")
+        failed = True
+    finally:
+        pool.close_all()
+    if progress is not None:
+        progress(done, plan.event_count)
+
+    if cancel_event is not None and cancel_event.is_set():
+        logging.info(f"Потоковая обработка отменена, папка {staging.output_dir} не изменена")
+        return []
+    if failed or any(writer.failed for writer in writers):
+        logging.error(f"Файлы не опубликованы из-за ошибок записи, папка {staging.output_dir} не изменена")
+        return None
+    file_names = list(dict.fromkeys(os.path.basename(writer.path) for writer in writers if writer.count))
+    written, errors = staging.publish(file_names, fsync=True)
+    if errors:
+        report_write_errors(errors, published=True)
+    logging.info(f"Потоковая обработка завершена: строк {done}, записано файлов {len(written)}")
+    return written
@@ -0,0 +1,83 @@
+import re
+from functools import lru_cache
+
+# Время .ass: H:MM:SS.cc. Допускаются часы из нескольких цифр, минуты и секунды из одной цифры,
+# дробная часть любой длины (или без нее), запятая вместо точки и знак минус.
+_ASS_TIME_RE = re.compile(r'\s*(-?)(\d+):(\d{1,2}):(\d{1,2})(?:[.,](\d*))?\s*$')
+
+# Время из командной строки: секунды, М:СС или Ч:ММ:СС, у секунд может быть дробная часть через точку или запятую
+_CLOCK_RE = re.compile(r'(?:(?:(\d+):)?(\d+):)?(\d+)(?:[.,](\d+))?')
+
+# Сколько отформатированных значений держать в кеше: одно и то же событие (например, строка
+# 'гуры/все') форматируется заново для каждого файла, в который оно попадает
+FORMAT_CACHE_SIZE = 1 << 16
+
+def parse_ass_time(value):
+    """Преобразует время .ass в целые сантисекунды; ValueError, если это не время.
+
+    Некорректные, но однозначные значения нормализуются: дробная часть из одной цифры — десятые,
+    из трех и более — округляется до сотых, без дробной части — ноль; минуты и секунды больше 59
+    переносятся в старший разряд (как в libass); отрицательное время считается нулем.
+    """
+    # Обычный случай H:MM:SS.cc разбирается без регулярного выражения: 'HMMSS' одним int
+    if len(value) == 10 and value[1] == ':' and value[4] == ':' and value[7] == '.':
+        digits = value[0] + value[2:4] + value[5:7]
+        fraction = value[8:]
+        if digits.isdecimal() and fraction.isdecimal():
+            number = int(digits)
+            return (number // 10000) * 360000 + (number // 100 % 100) * 6000 + (number % 100) * 100 + int(fraction)
+    match = _ASS_TIME_RE.match(value)
+    if match is None:
+        raise ValueError(f"Некорректное время: {value!r}")
+    negative, hours, minutes, seconds, fraction = match.groups()
+    if negative:
+        return 0
+    if not fraction:
+        centiseconds = 0
+    elif len(fraction) <= 2:
+        centiseconds = int(fraction.ljust(2, '0'))
+    else:
+        # Округление до сотых: 1.995 → 2.00
+        centiseconds = (int(fraction[:3]) + 5) // 10
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 100 + centiseconds
+
+def _split(cs):
+    seconds, cs = divmod(cs, 100)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return hours, minutes, seconds, cs
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_ass_time(cs):
+    """Форматирует сантисекунды во время .ass (H:MM:SS.cc)."""
+    hours, minutes, seconds, cs = _split(cs)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{cs:02d}"
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_srt_cs(cs):
+    """Форматирует сантисекунды во время .srt (HH:MM:SS,mmm)."""
+    hours, minutes, seconds, cs = _split(cs)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{cs:02d}0"
+
+def ass_to_srt_time(value):
+    """Переводит время .ass в .srt через сантисекунды (с нормализацией parse_ass_time)."""
+    return format_srt_cs(parse_ass_time(value))
+
+def parse_clock(value):
+    """Время из командной строки в сантисекунды: '750', '12:30', '1:02:03.5'; ValueError при ошибке.
+
+    Минуты и секунды после двоеточия должны быть меньше 60; дробная часть секунд округляется до сотых.
+    """
+    match = _CLOCK_RE.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"Некорректное время: {value!r}")
+    hours, minutes, seconds, fraction = match.groups()
+    if (minutes is not None and int(seconds) >= 60) or (hours is not None and int(minutes) >= 60):
+        raise ValueError(f"Некорректное время: {value!r}")
+    centiseconds = (int(fraction[:3].ljust(3, '0')) + 5) // 10 if fraction else 0
+    return ((int(hours or 0) * 60 + int(minutes or 0)) * 60 + int(seconds)) * 100 + centiseconds
+
+def format_file_time(cs):
+    """Время для имени файла (H.MM.SS): двоеточия в именах файлов Windows недопустимы."""
+    seconds = cs // 100
+    return f"{seconds // 3600}.{seconds // 60 % 60:02d}.{seconds % 60:02d}"
@@ -0,0 +1,184 @@
+from bisect import bisect_left, bisect_right
+from array import array
+
+from .core import timeline_key
+from .timecode import format_ass_time
+
+# Окно для поиска самых загруженных отрезков: одна минута в сантисекундах
+MINUTE = 6000
+BUSIEST_TOP = 3
+
+class IntervalIndex:
+    """Статический индекс полуинтервалов [start, end) событий для запросов пересечения за O(log n + k).
+
+    События с началом внутри запроса ищутся бинарным поиском по отсортированным началам,
+    события, начавшиеся раньше и еще идущие в его начале, — центрированным деревом интервалов
+    (в каждом узле интервалы, накрывающие центр, отсортированы по началу и по концу).
+    Оба множества не пересекаются, поэтому каждое событие возвращается один раз.
+    """
+
+    def __init__(self, events):
+        self.events = sorted(events, key=timeline_key)
+        self.starts = array('i', (event.start for event in self.events))
+        # Строки нулевой длины ни в какой момент не идут, в дереве они не нужны
+        self._root = self._build([position for position, event in enumerate(self.events) if event.end > event.start])
+
+    def __len__(self):
+        return len(self.events)
+
+    def _build(self, positions):
+        # Узел: (центр, позиции по началу, позиции по убыванию конца, левое поддерево, правое поддерево)
+        if not positions:
+            return None
+        events = self.events
+        center = events[positions[len(positions) // 2]].start
+        left, middle, right = [], [], []
+        for position in positions:
+            event = events[position]
+            if event.end <= center:
+                left.append(position)
+            elif event.start > center:
+                right.append(position)
+            else:
+                middle.append(position)
+        by_end = sorted(middle, key=lambda position: events[position].end, reverse=True)
+        return center, middle, by_end, self._build(left), self._build(right)
+
+    def _stab(self, time, before):
+        """События с start < before, идущие в момент time (start <= time < end)."""
+        events = self.events
+        found = []
+        node = self._root
+        while node is not None:
+            center, by_start, by_end, left, right = node
+            if time < center:
+                for position in by_start:
+                    event = events[position]
+                    if event.start > time:
+                        break
+                    if event.start < before and event.end > time:
+                        found.append(event)
+                node = left
+            else:
+                for position in by_end:
+                    event = events[position]
+                    if event.end <= time:
+                        break
+                    if event.start < before:
+                        found.append(event)
+                node = right
+        return found
+
+    def overlapping(self, start, end):
+        """События, пересекающиеся с [start, end), в хронологическом порядке."""
+        if end <= start:
+            return []
+        events = self.events
+        first = bisect_left(self.starts, start)
+        last = bisect_left(self.starts, end)
+        found = self._stab(start, start)
+        found.extend(event for event in events[first:last] if event.end > start)
+        found.sort(key=timeline_key)
+        return found
+
+    def at(self, time):
+        """События, идущие в момент time."""
+        return self.overlapping(time, time + 1)
+
+    def starting_between(self, start, end):
+        """События с началом в [start, end)."""
+        return self.events[bisect_left(self.starts, start):bisect_right(self.starts, end - 1)]
+
+def speaking_time(events):
+    """Суммарная длительность объединения интервалов событий (наложения не считаются дважды)."""
+    total = 0
+    current_start = current_end = None
+    for event in sorted(events, key=timeline_key):
+        if current_end is None or event.start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = event.start, event.end
+        elif event.end > current_end:
+            current_end = event.end
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+def busiest_windows(events, window=MINUTE, top=BUSIEST_TOP):
+    """Самые загруженные окна длиной window: [(начало окна, время речи в окне, число строк)]."""
+    load = {}
+    counts = {}
+    for event in events:
+        for bucket in range(event.start // window, (max(event.end, event.start + 1) - 1) // window + 1):
+            bucket_start = bucket * window
+            overlap = min(event.end, bucket_start + window) - max(event.start, bucket_start)
+            load[bucket] = load.get(bucket, 0) + max(overlap, 0)
+            counts[bucket] = counts.get(bucket, 0) + 1
+    ranked = sorted(load, key=lambda bucket: (-load[bucket], bucket))[:top]
+    return [(bucket * window, load[bucket], counts[bucket]) for bucket in ranked]
+
+class ActorTimeline:
+    """Строки одного актера (свои, множественные роли и исключения, которые его не исключают) и индекс по ним."""
+
+    def __init__(self, actor, events):
+        self.actor = actor
+        self.index = IntervalIndex(events)
+
+    def overlaps(self):
+        """Пары строк актера, идущих одновременно: [(раньше, позже)]."""
+        pairs = []
+        for event in self.index.events:
+            key = timeline_key(event)
+            for other in self.index.overlapping(event.start, event.end):
+                if timeline_key(other) > key:
+                    pairs.append((event, other))
+        return pairs
+
+    def collisions(self, group_index):
+        """Пары (строка актера, строка 'гуры/все'), идущие одновременно."""
+        return [(event, group_event) for event in self.index.events for group_event in group_index.overlapping(event.start, event.end)]
+
+def build_timelines(classification):
+    """ActorTimeline для каждого актера и IntervalIndex строк 'гуры/все' по результату classify_events."""
+    multiple_actor_lines = classification.multiple_actor_lines
+    excluded_actor_groups = classification.excluded_actor_groups
+    actor_index = classification.actor_index
+    timelines = {}
+    for actor, own_events in classification.actors.items():
+        events = list(own_events)
+        events.extend(actor_index.multiple_lines_for(actor, multiple_actor_lines))
+        events.extend(actor_index.excluded_lines_for(actor, excluded_actor_groups))
+        timelines[actor] = ActorTimeline(actor, events)
+    return timelines, IntervalIndex(classification.group_lines)
+
+def timeline_report(classification, window=MINUTE, top=BUSIEST_TOP):
+    """Сводка для записи: по каждому актеру строки, время речи, наложения своих строк,
+    пересечения с 'гуры/все' и самые загруженные окна. Время — в сантисекундах."""
+    timelines, group_index = build_timelines(classification)
+    report = {}
+    for actor in sorted(timelines):
+        timeline = timelines[actor]
+        events = timeline.index.events
+        report[actor] = {
+            'lines': len(events),
+            'speaking_time': speaking_time(events),
+            'overlaps': timeline.overlaps(),
+            'group_collisions': timeline.collisions(group_index),
+            'busiest': busiest_windows(events, window, top),
+        }
+    return report
+
+def format_timeline_report(report):
+    """Текст отчета для консоли."""
+    lines = []
+    for actor, stats in report.items():
+        lines.append(f"{actor}: строк {stats['lines']}, время речи {format_ass_time(stats['speaking_time'])}, "
+                     f"наложений {len(stats['overlaps'])}, пересечений с 'гуры/все' {len(stats['group_collisions'])}")
+        for first, second in stats['overlaps']:
+            lines.append(f"    наложение: {format_ass_time(first.start)}-{format_ass_time(first.end)} и {format_ass_time(second.start)}-{format_ass_time(second.end)}")
+        for event, group_event in stats['group_collisions']:
+            lines.append(f"    'гуры/все': {format_ass_time(event.start)}-{format_ass_time(event.end)} и {format_ass_time(group_event.start)}-{format_ass_time(group_event.end)}")
+        if stats['busiest']:
+            windows = ", ".join(f"{format_ass_time(start)} ({format_ass_time(load)}, строк {count})" for start, load, count in stats['busiest'])
+            lines.append(f"    самые загруженные отрезки: {windows}")
+    return "\n".join(lines)
@@ -0,0 +1,157 @@
+import os
+import re
+from operator import attrgetter
+
+from .timecode import format_srt_cs
+
+ASS_STYLES_FORMAT = 'Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding'
+ASS_EVENTS_FORMAT = 'Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text'
+SRT_GUARD_TEXT = "(Защита от удаления первого саба REAPER'ом!)"
+
+# Файлы раньше писались в текстовом режиме, поэтому перевод строки — системный
+EOL = os.linesep
+# Тег \rИмяСтиля внутри {...} переключает стиль: такие стили тоже считаются используемыми
+_RESET_STYLE_RE = re.compile(r'\\r([^\\}]+)')
+
+def srt_text(text):
+    """Приводит текст события .ass к тексту .srt: \\N → пробел, без {i} и фигурных скобок.
+
+    Цепочка str.replace работает в C и на кириллице заметно быстрее и str.translate, и посимвольного фильтра.
+    """
+    return text.replace('\\N', ' ').replace('{i}', '').replace('{', '').replace('}', '')
+
+def style_name(style_line):
+    """Возвращает имя стиля из строки 'Style: Имя,...' или None для прочих строк секции."""
+    if not style_line.startswith('Style:'):
+        return None
+    return style_line[6:].split(',', 1)[0].strip()
+
+def used_style_names(events):
+    """Собирает имена стилей событий и стилей, на которые ссылаются теги \\r в тексте."""
+    return add_reset_style_names(event_style_names(events), events)
+
+def event_style_names(events):
+    """Имена стилей из поля Style событий (без учета тегов \\r)."""
+    # Стилей в файле единицы, поэтому strip применяется к множеству, а не к каждому событию
+    return {style.strip() for style in set(map(attrgetter('style'), events))}
+
+def add_reset_style_names(names, events):
+    """Добавляет в names стили из тегов \\r в текстах событий и возвращает names."""
+    for text in [event.text for event in events if '\\r' in event.text]:
+        names.update(reset_style_names(text))
+    return names
+
+def reset_style_names(text):
+    """Имена стилей из тегов \\r в тексте события."""
+    return [match.strip() for match in _RESET_STYLE_RE.findall(text)]
+
+class AssHeader:
+    """Секции [Script Info] и [V4+ Styles] одного исходного файла, закодированные в байты один раз.
+
+    Для каждого набора используемых стилей байты кешируются, поэтому сотни выходных файлов
+    одного эпизода не сериализуют заголовок заново. При prune_styles=True в файл попадают
+    только стили, которые встречаются в его событиях.
+    """
+
+    def __init__(self, headers, styles, prune_styles=True):
+        self.headers = headers
+        self.styles = styles
+        self.prune_styles = prune_styles
+        self.style_names = {name for name in map(style_name, styles) if name is not None}
+        self._cache = {}
+
+    def _render(self, keep):
+        parts = ['[Script Info]']
+        parts.extend(self.headers)
+        parts.append(EOL + '[V4+ Styles]')
+        parts.append(ASS_STYLES_FORMAT)
+        parts.extend(style for style in self.styles if keep is None or style_name(style) in (None, *keep))
+        parts.append(EOL + '[Events]')
+        parts.append(ASS_EVENTS_FORMAT)
+        parts.append('')
+        return EOL.join(parts).encode('utf-8')
+
+    def encode(self, events=None):
+        """Возвращает байты заголовка (со строкой Format секции [Events]) для данных событий."""
+        if events is None or not self.prune_styles:
+            return self.encode_for_styles(None)
+        used = event_style_names(events)
+        if not self.style_names <= used:
+            # Тексты просматриваются, только если теги \\r могут оставить в файле еще какие-то стили
+            add_reset_style_names(used, events)
+        return self.encode_for_styles(used)
+
+    def encode_for_styles(self, used):
+        """То же, что encode, но по заранее собранному набору имен стилей (None — все стили)."""
+        keep = None
+        if self.prune_styles and used is not None:
+            keep = self.style_names & used
+            if used - self.style_names and 'Default' in self.style_names:
+                keep.add('Default')  # рендерер подставит Default вместо отсутствующего стиля
+            keep = frozenset(keep)
+        header = self._cache.get(keep)
+        if header is None:
+            header = self._cache[keep] = self._render(keep)
+        return header
+
+# Сколько строк событий кодируется за раз: небольшие блоки остаются в кеше процессора, а на больших
+# файлах это быстрее, чем кодировать и выделять весь файл одним куском
+BLOCK_LINES = 512
+
+def iter_ass_blocks(header, events):
+    """Отдает содержимое .ass файла блоками байтов: закешированный заголовок, затем строки событий."""
+    yield header.encode(events)
+    lines = [event.line for event in events]
+    for start in range(0, len(lines), BLOCK_LINES):
+        yield (EOL.join(lines[start:start + BLOCK_LINES]) + EOL).encode('utf-8')
+
+def render_ass(header, events):
+    """Собирает содержимое .ass файла в байты: закешированный заголовок и строки событий."""
+    return b''.join(iter_ass_blocks(header, events))
+
+def srt_guard(first_start):
+    """Защитный первый субтитр .srt для REAPER: от нуля до начала первой реплики (строка с \\n).
+
+    Если первая реплика начинается с нуля (например, после --rebase), субтитр нулевой длины, который
+    некоторые плееры не принимают, не нужен: возвращается пустая строка.
+    """
+    if first_start <= 0:
+        return ''
+    return f"1\n00:00:00,000 --> {format_srt_cs(first_start)}\n{SRT_GUARD_TEXT}\n\n"
+
+def srt_entry(index, event):
+    """Один блок .srt (строка с \\n)."""
+    return f"{index}\n{format_srt_cs(event.start)} --> {format_srt_cs(event.end)}\n{srt_text(event.text)}\n\n"
+
+def render_srt(events):
+    """Собирает содержимое .srt файла в байты, начиная с защитного субтитра для REAPER (если он нужен)."""
+    guard = srt_guard(events[0].start if events else 0)
+    parts = [guard]
+    parts.extend(srt_entry(index, event) for index, event in enumerate(events, 2 if guard else 1))
+    content = ''.join(parts)
+    if EOL != '\n':
+        content = content.replace('\n', EOL)
+    return content.encode('utf-8')
+
+def write_bytes(path, data, fsync=False):
+    """Записывает байты в файл; при fsync=True дожидается их записи на диск."""
+    with open(path, 'wb') as file:
+        file.write(data)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+
+def write_atomic(path, data):
+    """Записывает байты во временный файл рядом с path и атомарно заменяет им path."""
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise